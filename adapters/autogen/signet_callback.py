@@ -3,13 +3,199 @@ Signet Protocol - AutoGen Integration
 Callback handler for verified AI-to-AI communications in AutoGen.
 """
 
+import asyncio
+import functools
+import importlib.util
+import inspect
+import itertools
 import json
+import logging
+import re
+import secrets
+import threading
 import uuid
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Union, Callable
 import autogen
 from autogen import ConversableAgent, GroupChat, GroupChatManager
 
+logger = logging.getLogger("signet.autogen")
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; async paths fall back to a worker thread
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# HTTP/2 multiplexing needs the optional `h2` package alongside httpx
+_HTTP2 = httpx is not None and importlib.util.find_spec("h2") is not None
+
+# Keyword tables compiled once at import; matching runs in the C regex engine
+_ROUTE_FUNC_RE = re.compile(
+    r"invoice|payment|billing|financial|generate_receipt|create_order"
+    r"|process_transaction|calculate_total|apply_discount",
+    re.IGNORECASE
+)
+_FIN_TERM_RE = re.compile(r"invoice|payment|order|transaction|receipt|billing", re.IGNORECASE)
+_RESULT_TERM_RE = re.compile(r"invoice|payment|order|transaction|receipt", re.IGNORECASE)
+
+# Field tables are frozensets so membership runs as one C-level
+# frozenset.isdisjoint(dict) pass over the smaller side
+_FIN_FIELDS = frozenset({'amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price'})
+_RESULT_FIELDS = _FIN_FIELDS - {'customer'}
+
+# Negative prefilter on raw JSON text: no quoted financial key anywhere means the
+# decoded object cannot carry one at top level either, so decoding can be skipped.
+# Derived from _FIN_FIELDS so the two can never drift apart.
+_FIN_KEY_RE = re.compile('"(?:' + '|'.join(map(re.escape, sorted(_FIN_FIELDS))) + ')"')
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body once, straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(text: str) -> Any:
+    """Decode tool output JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _first_nonspace(text: str) -> str:
+    """First non-whitespace character without building a stripped copy."""
+    for ch in text:
+        if not ch.isspace():
+            return ch
+    return ''
+
+
+@functools.lru_cache(maxsize=1024)
+def _route_function_name(function_name: str) -> bool:
+    """Cached routing decision; the same tool names recur across agents."""
+    return _ROUTE_FUNC_RE.search(function_name) is not None
+
+
+# Classifiers below are pure, strictly typed functions over str/dict so they can be
+# compiled ahead of time (e.g. mypyc) without changes; the scans they perform
+# already run in C (regex engine, set lookups).
+
+@functools.lru_cache(maxsize=1024)
+def _name_looks_financial(function_name: str) -> bool:
+    """Cached name half of the financial-data check."""
+    return _FIN_TERM_RE.search(function_name) is not None
+
+
+@functools.lru_cache(maxsize=1024)
+def _result_name_looks_financial(func_name: str) -> bool:
+    """Cached name half of the decorator's financial-result check."""
+    return _RESULT_TERM_RE.search(func_name) is not None
+
+
+def _payload_is_financial(data: Dict[str, Any], function_name: str) -> bool:
+    """Financial-sounding function name, or financial fields at top level."""
+    # The name test is a cache hit for recurring tools and skips the key scan
+    return _name_looks_financial(function_name) or not _FIN_FIELDS.isdisjoint(data)
+
+
+# Mapping every adapter payload targets (see server/schemas/maps)
+_PAYLOAD_TYPES = {
+    "payload_type": "openai.tooluse.invoice.v1",
+    "target_type": "invoice.iso20022.v1"
+}
+
+
+def _pooled_session() -> requests.Session:
+    """Session with a sized keep-alive pool and retries on transient gateway errors.
+    
+    Retrying POST is safe here: every exchange carries an idempotency key.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["POST", "GET"]),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=32)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Pooled session shared by the module-level helpers below
+_SESSION = _pooled_session()
+
+# (event loop, httpx.AsyncClient) shared by decorated async tools; an async
+# client's connections belong to one loop, so it is rebuilt when the loop changes
+_ASYNC_CLIENT: Optional[tuple] = None
+
+
+def _shared_async_client():
+    """The pooled async client for the running event loop, created on first use."""
+    global _ASYNC_CLIENT
+    loop = asyncio.get_running_loop()
+    cached = _ASYNC_CLIENT
+    if cached is None or cached[0] is not loop:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=30
+        )
+        cached = _ASYNC_CLIENT = (loop, client)
+    return cached[1]
+
+# Idempotency keys: random per-process prefix + monotonic counter (no RNG per call)
+_ID_PREFIX = secrets.token_hex(8)
+_ID_COUNTER = itertools.count()
+
+@dataclass(frozen=True, slots=True)
+class SignetContext:
+    """Immutable correlation context for one AutoGen conversation."""
+    workflow_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    
+    @classmethod
+    def new(cls, prefix: str = "autogen") -> "SignetContext":
+        return cls(workflow_id=f"{prefix}-{uuid.uuid4()}", span_id=secrets.token_hex(8))
+    
+    def child(self) -> "SignetContext":
+        """Derive a context for a nested step without mutating this one."""
+        return SignetContext(self.workflow_id, secrets.token_hex(8), self.span_id)
+    
+    def to_metadata(self) -> Dict[str, Optional[str]]:
+        return {
+            "workflow_id": self.workflow_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptRef:
+    """The parts of a Signet receipt the handler keeps for the session summary."""
+    hop: Optional[int]
+    receipt_hash: Optional[str]
+    cid: Optional[str]
+    
+    @classmethod
+    def from_receipt(cls, receipt: Dict[str, Any]) -> "ReceiptRef":
+        return cls(receipt.get("hop"), receipt.get("receipt_hash"), receipt.get("cid"))
+
+
 class SignetAutoGenHandler:
     """
     AutoGen integration that routes function calls through Signet Protocol.
@@ -34,6 +220,9 @@ class SignetAutoGenHandler:
         forward_url: Optional[str] = None,
         tenant: Optional[str] = None,
         auto_forward: bool = True,
+        batch_size: int = 32,
+        batch_window: float = 0.01,
+        batch_sync: bool = False,
         **kwargs
     ):
         self.signet_url = signet_url.rstrip('/')
@@ -41,21 +230,66 @@ class SignetAutoGenHandler:
         self.forward_url = forward_url
         self.tenant = tenant or "autogen"
         self.auto_forward = auto_forward
-        self.session = requests.Session()
+        self.session = _pooled_session()
+        self._exchange_request = None
+        self._send_settings = {}
+        self._async_client = None
+        self._async_client_loop = None
+        self._id_prefix = secrets.token_hex(8)
+        self._id_counter = itertools.count()
+        
+        # Headers shared by every request; only the idempotency key varies
+        self._base_headers = {
+            "X-SIGNET-API-Key": api_key,
+            "Content-Type": "application/json"
+        }
+        
+        # Invariant part of every exchange payload, built once per handler
+        self._payload_template = {
+            **_PAYLOAD_TYPES,
+            "forward_url": forward_url if auto_forward else None
+        }
+        
+        # Exchange batching: async tools coalesce within `batch_window` seconds;
+        # sync tools only queue when `batch_sync` is set (receipts arrive on flush)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.batch_sync = batch_sync
+        self._pending = []
+        self._pending_async = []
+        self._flush_handle = None
+        self._flush_tasks = set()
+        self._batch_loop = None
         
         # Track current trace for chaining
-        self.current_trace_id = None
+        self.context: Optional[SignetContext] = None
         self.verified_exchanges = []
-        self.wrapped_agents = set()
+        self.wrapped_agents = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._wrapper_cache = weakref.WeakValueDictionary()
+    
+    @property
+    def current_trace_id(self) -> Optional[str]:
+        """Trace id sent with every exchange (the context's workflow id)."""
+        return self.context.workflow_id if self.context else None
+    
+    @current_trace_id.setter
+    def current_trace_id(self, trace_id: Optional[str]) -> None:
+        self.context = SignetContext(trace_id, secrets.token_hex(8)) if trace_id else None
     
     def wrap_agent(self, agent: ConversableAgent) -> ConversableAgent:
         """Wrap an AutoGen agent to route function calls through Signet Protocol."""
-        if id(agent) in self.wrapped_agents:
-            return agent  # Already wrapped
-        
-        # Generate trace ID for this session
-        if not self.current_trace_id:
-            self.current_trace_id = f"autogen-{uuid.uuid4()}"
+        with self._lock:
+            if getattr(agent, '_signet_wrapped', False):
+                return agent  # Already wrapped
+            
+            # Claim the agent (the attribute survives id() reuse after GC)
+            agent._signet_wrapped = True
+            self.wrapped_agents.add(agent)
+            
+            # Generate trace ID for this session
+            if self.context is None:
+                self.context = SignetContext.new()
         
         # Store original function map
         original_function_map = getattr(agent, '_function_map', {})
@@ -76,42 +310,37 @@ class SignetAutoGenHandler:
         
         def wrapped_generate_reply(messages=None, sender=None, **kwargs):
             # Check if this is the start of a new conversation
-            if not self.current_trace_id:
-                self.current_trace_id = f"autogen-{uuid.uuid4()}"
-                print(f"🔗 Signet: AutoGen conversation starting (trace: {self.current_trace_id})")
+            if self.context is None:
+                self.context = SignetContext.new()
+                logger.info("AutoGen conversation starting (trace: %s)", self.current_trace_id)
             
             try:
                 reply = original_generate_reply(messages, sender, **kwargs)
                 return reply
             except Exception as e:
-                print(f"⚠️ Signet: Error in agent reply: {str(e)}")
+                logger.warning("Error in agent reply: %s", e)
                 raise
         
         agent.generate_reply = wrapped_generate_reply
         
-        # Mark as wrapped
-        self.wrapped_agents.add(id(agent))
-        
-        print(f"✅ Signet: Wrapped AutoGen agent '{agent.name}'")
+        logger.info("Wrapped AutoGen agent %r", agent.name)
         return agent
     
     def wrap_group_chat(self, group_chat: GroupChat) -> GroupChat:
-        """Wrap all agents in a group chat."""
-        for agent in group_chat.agents:
-            self.wrap_agent(agent)
+        """Wrap all agents in a group chat (independent agents are wrapped in parallel)."""
+        agents = list(group_chat.agents)
+        if len(agents) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(agents))) as executor:
+                list(executor.map(self.wrap_agent, agents))
+        else:
+            for agent in agents:
+                self.wrap_agent(agent)
         return group_chat
     
     def _should_route_function(self, function_name: str) -> bool:
         """Determine if a function should be routed through Signet."""
         # Route financial/invoice/data processing functions through Signet
-        signet_functions = [
-            'create_invoice', 'process_payment', 'generate_receipt',
-            'update_invoice', 'create_order', 'process_transaction',
-            'calculate_total', 'apply_discount', 'validate_payment',
-            'invoice', 'payment', 'billing', 'financial'
-        ]
-        
-        return any(signet_func in function_name.lower() for signet_func in signet_functions)
+        return _route_function_name(function_name)
     
     def _wrap_function(self, func_info: Dict[str, Any], function_name: str) -> Dict[str, Any]:
         """Wrap a function to route its output through Signet Protocol."""
@@ -119,8 +348,49 @@ class SignetAutoGenHandler:
         if not original_func:
             return func_info
         
+        # Tools shared across agents reuse one wrapper; entries vanish with the
+        # last agent holding the wrapper, and the wrapper pins original_func so
+        # its id cannot be recycled while cached
+        cache_key = (id(original_func), function_name)
+        wrapped_function = self._wrapper_cache.get(cache_key)
+        if wrapped_function is None:
+            wrapped_function = self._make_wrapper(original_func, function_name)
+            self._wrapper_cache[cache_key] = wrapped_function
+        
+        # Create new function info with wrapped function in a single build
+        return {**func_info, 'function': wrapped_function}
+    
+    def _make_wrapper(self, original_func: Callable, function_name: str) -> Callable:
+        """Build the sync or async wrapper that routes a tool's output through Signet."""
+        if inspect.iscoroutinefunction(original_func):
+            async def wrapped_function(*args, **kwargs):
+                logger.debug("Routing function %r through protocol", function_name)
+                
+                try:
+                    # Execute original coroutine
+                    result = await original_func(*args, **kwargs)
+                    
+                    # Parse and route through Signet without blocking the event loop
+                    parsed_output = self._parse_function_output(result, function_name, args, kwargs)
+                    
+                    if parsed_output:
+                        receipt = await self._submit_async(parsed_output)
+                        if receipt:
+                            self.verified_exchanges.append(ReceiptRef.from_receipt(receipt))
+                            logger.debug("Verified exchange recorded (hop: %s)", receipt.get('hop'))
+                        else:
+                            logger.warning("Exchange verification failed for %r", function_name)
+                    
+                    return result
+                
+                except Exception as e:
+                    logger.warning("Error in wrapped function %r: %s", function_name, e)
+                    raise
+            
+            return wrapped_function
+        
         def wrapped_function(*args, **kwargs):
-            print(f"🎯 Signet: Routing function '{function_name}' through protocol")
+            logger.debug("Routing function %r through protocol", function_name)
             
             try:
                 # Execute original function
@@ -129,25 +399,23 @@ class SignetAutoGenHandler:
                 # Parse and route through Signet
                 parsed_output = self._parse_function_output(result, function_name, args, kwargs)
                 
-                if parsed_output:
+                if parsed_output and self.batch_sync:
+                    self._queue_sync(parsed_output)
+                elif parsed_output:
                     receipt = self._send_to_signet(parsed_output)
                     if receipt:
-                        self.verified_exchanges.append(receipt)
-                        print(f"✅ Signet: Verified exchange recorded (hop: {receipt.get('hop')})")
+                        self.verified_exchanges.append(ReceiptRef.from_receipt(receipt))
+                        logger.debug("Verified exchange recorded (hop: %s)", receipt.get('hop'))
                     else:
-                        print("❌ Signet: Exchange verification failed")
+                        logger.warning("Exchange verification failed for %r", function_name)
                 
                 return result
             
             except Exception as e:
-                print(f"⚠️ Signet: Error in wrapped function: {str(e)}")
+                logger.warning("Error in wrapped function %r: %s", function_name, e)
                 raise
         
-        # Create new function info with wrapped function
-        wrapped_info = func_info.copy()
-        wrapped_info['function'] = wrapped_function
-        
-        return wrapped_info
+        return wrapped_function
     
     def _parse_function_output(
         self, 
@@ -159,16 +427,24 @@ class SignetAutoGenHandler:
         """Parse function output to extract structured data suitable for Signet."""
         try:
             # Try to parse output as JSON first
-            if isinstance(output, str) and output.strip().startswith('{'):
-                data = json.loads(output)
+            if isinstance(output, str) and _first_nonspace(output) == '{':
+                if _FIN_KEY_RE.search(output) is None and not _name_looks_financial(function_name):
+                    return None
+                data = _loads(output)
             elif isinstance(output, dict):
                 data = output
             else:
-                # Create structured data from function call and output
+                # The synthesized record carries no financial fields, so only the
+                # function name can qualify it; check before copying any arguments
+                if not _name_looks_financial(function_name):
+                    return None
+                
+                # Create structured data from function call and output (the args
+                # tuple encodes as a JSON array as-is)
                 data = {
                     "function_name": function_name,
                     "arguments": {
-                        "args": list(args),
+                        "args": args,
                         "kwargs": kwargs
                     },
                     "result": str(output)
@@ -180,67 +456,268 @@ class SignetAutoGenHandler:
             
             return None
             
-        except (json.JSONDecodeError, Exception):
+        except (ValueError, TypeError):
+            # Undecodable JSON (both decoders raise ValueError subclasses) or
+            # output that cannot be encoded as tool arguments
             return None
     
     def _is_financial_data(self, data: Dict[str, Any], function_name: str) -> bool:
         """Check if data structure looks like financial/invoice data."""
-        financial_fields = ['amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price']
-        financial_terms = ['invoice', 'payment', 'order', 'transaction', 'receipt', 'billing']
-        
-        # Check if data contains financial fields
-        has_financial_fields = any(field in data for field in financial_fields)
-        
-        # Check if function name suggests financial operation
-        has_financial_function = any(term in function_name.lower() for term in financial_terms)
-        
-        return has_financial_fields or has_financial_function
+        return _payload_is_financial(data, function_name)
     
     def _convert_to_signet_payload(self, data: Dict[str, Any], function_name: str) -> Dict[str, Any]:
         """Convert parsed data to Signet Protocol payload format."""
-        return {
-            "payload_type": "openai.tooluse.invoice.v1",
-            "target_type": "invoice.iso20022.v1",
-            "trace_id": self.current_trace_id,
-            "payload": {
-                "tool_calls": [{
-                    "type": "function",
-                    "function": {
-                        "name": function_name,
-                        "arguments": json.dumps(data)
-                    }
-                }]
-            },
-            "forward_url": self.forward_url if self.auto_forward else None
+        payload = self._payload_template.copy()
+        payload["trace_id"] = self.current_trace_id
+        payload["payload"] = {
+            "tool_calls": [{
+                "type": "function",
+                "function": {
+                    "name": function_name,
+                    "arguments": _dumps(data).decode("utf-8")
+                }
+            }]
         }
+        return payload
+    
+    def _next_idempotency_key(self) -> str:
+        """Time-ordered, collision-free key: trace + session prefix + counter."""
+        return f"{self.current_trace_id}-{self._id_prefix}-{next(self._id_counter)}"
+    
+    def _exchange_template(self) -> requests.PreparedRequest:
+        """Prepare the /v1/exchange request once; sends copy it and set the body."""
+        if self._exchange_request is None:
+            url = f"{self.signet_url}/v1/exchange"
+            self._send_settings = self.session.merge_environment_settings(url, {}, None, None, None)
+            self._exchange_request = self.session.prepare_request(
+                requests.Request("POST", url, headers=self._base_headers)
+            )
+        return self._exchange_request
     
     def _send_to_signet(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Send payload to Signet Protocol for verification."""
         try:
-            headers = {
-                "X-SIGNET-API-Key": self.api_key,
-                "X-SIGNET-Idempotency-Key": f"{self.current_trace_id}-{uuid.uuid4()}",
-                "Content-Type": "application/json"
-            }
+            # Reissue a prepared template instead of going through session.post,
+            # which re-merges headers, cookies, hooks and env settings per call
+            request = self._exchange_template().copy()
+            request.headers["X-SIGNET-Idempotency-Key"] = self._next_idempotency_key()
+            request.prepare_body(_dumps(payload), None)
             
-            response = self.session.post(
-                f"{self.signet_url}/v1/exchange",
-                json=payload,
-                headers=headers,
+            response = self.session.send(request, timeout=30, **self._send_settings)
+            
+            if response.status_code == 200:
+                result = response.json()
+                return result.get("receipt")
+            else:
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+                return None
+                
+        except Exception as e:
+            logger.warning("Signet request failed: %s", e)
+            return None
+    
+    def _get_async_client(self):
+        """Lazily create the pooled async client for the running event loop.
+
+        An httpx client's connections belong to the loop that opened them, so a
+        client left over from an earlier (possibly closed) loop is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_keepalive_connections=32),
                 timeout=30
             )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def _send_to_signet_async(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Awaitable variant of `_send_to_signet` for async agents and tools."""
+        if httpx is None:
+            return await asyncio.to_thread(self._send_to_signet, payload)
+        
+        try:
+            headers = {**self._base_headers, "X-SIGNET-Idempotency-Key": self._next_idempotency_key()}
+            
+            response = await self._get_async_client().post(
+                f"{self.signet_url}/v1/exchange",
+                content=_dumps(payload),
+                headers=headers
+            )
             
             if response.status_code == 200:
                 result = response.json()
                 return result.get("receipt")
             else:
-                print(f"❌ Signet API error: {response.status_code} - {response.text}")
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ Signet request failed: {str(e)}")
+            logger.warning("Signet request failed: %s", e)
             return None
     
+    def _batch_body(self, batch: List[tuple]) -> bytes:
+        """Encode queued (idempotency key, payload) pairs for /v1/exchange:batch."""
+        return _dumps({
+            "exchanges": [{**payload, "idempotency_key": key} for key, payload in batch]
+        })
+    
+    def _batch_receipts(self, response, size: int) -> List[Optional[Dict[str, Any]]]:
+        """Map a batch response back to one receipt (or None) per queued item."""
+        if response.status_code != 200:
+            logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+            return [None] * size
+        results = response.json().get("results", [])
+        receipts = [
+            (item.get("response") or {}).get("receipt") if item.get("status_code") == 200 else None
+            for item in results
+        ]
+        return (receipts + [None] * size)[:size]
+    
+    def _send_batch(self, batch: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+        """POST queued exchanges in one request; one receipt (or None) per item."""
+        try:
+            response = self.session.post(
+                f"{self.signet_url}/v1/exchange:batch",
+                data=self._batch_body(batch),
+                headers=self._base_headers,
+                timeout=30
+            )
+            return self._batch_receipts(response, len(batch))
+        except Exception as e:
+            logger.warning("Signet batch request failed: %s", e)
+            return [None] * len(batch)
+    
+    def _queue_sync(self, payload: Dict[str, Any]) -> None:
+        """Queue a sync exchange; flush once `batch_size` items are pending."""
+        key = self._next_idempotency_key()
+        with self._lock:
+            self._pending.append((key, payload))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Send queued sync exchanges now. Returns the number of receipts recorded."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        receipts = [r for r in self._send_batch(batch) if r]
+        self.verified_exchanges.extend(ReceiptRef.from_receipt(r) for r in receipts)
+        logger.debug("Batch verified %d/%d exchanges", len(receipts), len(batch))
+        return len(receipts)
+    
+    def _batch_event_loop(self) -> "asyncio.AbstractEventLoop":
+        """Return the running loop, dropping async batch state left by another loop.
+
+        Queued futures, the flush timer and flush tasks belong to the loop that
+        created them; once that loop is gone they can never complete.
+        """
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop:
+            self._pending_async = []
+            self._flush_handle = None
+            self._flush_tasks = set()
+            self._batch_loop = loop
+        return loop
+    
+    async def _submit_async(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Queue an exchange for the next batch and await its receipt."""
+        loop = self._batch_event_loop()
+        future = loop.create_future()
+        self._pending_async.append((self._next_idempotency_key(), payload, future))
+        if len(self._pending_async) >= self.batch_size:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._start_flush)
+        return await future
+    
+    def _start_flush(self) -> None:
+        """Detach the pending async batch and send it on a tracked task."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending_async = self._pending_async, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush_async(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(functools.partial(self._on_flush_done, batch))
+    
+    def _on_flush_done(self, batch: List[tuple], task: "asyncio.Task") -> None:
+        """Untrack a finished flush task and hand any failure to the callers awaiting it."""
+        self._flush_tasks.discard(task)
+        error = None if task.cancelled() else task.exception()
+        if not task.cancelled() and error is None:
+            return
+        if error is not None:
+            logger.warning("Signet batch flush failed: %s", error)
+        for _, _, future in batch:
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+    
+    async def _flush_async(self, batch: List[tuple]) -> None:
+        """POST one async batch and resolve each caller's future."""
+        items = [(key, payload) for key, payload, _ in batch]
+        if httpx is None:
+            receipts = await asyncio.to_thread(self._send_batch, items)
+        else:
+            try:
+                response = await self._get_async_client().post(
+                    f"{self.signet_url}/v1/exchange:batch",
+                    content=self._batch_body(items),
+                    headers=self._base_headers
+                )
+                receipts = self._batch_receipts(response, len(items))
+            except Exception as e:
+                logger.warning("Signet batch request failed: %s", e)
+                receipts = [None] * len(items)
+        for (_, _, future), receipt in zip(batch, receipts, strict=True):
+            if not future.done():
+                future.set_result(receipt)
+    
+    async def verify_many(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        """Verify several payloads concurrently; one receipt, None or exception each.
+
+        The submissions share the async batch queue, so N payloads cost one
+        /v1/exchange:batch round trip instead of N sequential exchanges. A
+        single payload is sent directly, without waiting out `batch_window`.
+        """
+        if len(payloads) == 1 and not self._pending_async:
+            results = [await self._send_to_signet_async(payloads[0])]
+        else:
+            results = await asyncio.gather(
+                *(self._submit_async(payload) for payload in payloads),
+                return_exceptions=True
+            )
+        self.verified_exchanges.extend(
+            ReceiptRef.from_receipt(r) for r in results if isinstance(r, dict)
+        )
+        return results
+
+    async def aflush(self) -> None:
+        """Send any queued async exchanges and wait for in-flight batches."""
+        self._batch_event_loop()
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+    
+    async def aclose(self) -> None:
+        """Drain queued exchanges, then close the pooled async client."""
+        await self.aflush()
+        if self._pending:
+            await asyncio.to_thread(self.flush)
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
+    
     def export_chain(self) -> Optional[Dict[str, Any]]:
         """Export the complete receipt chain."""
         if not self.current_trace_id:
@@ -254,13 +731,13 @@ class SignetAutoGenHandler:
             
             if response.status_code == 200:
                 export_data = response.json()
-                print(f"📤 Signet: Chain exported - {len(self.verified_exchanges)} receipts")
+                logger.info("Chain exported - %d receipts", len(self.verified_exchanges))
                 return export_data
             
             return None
             
         except Exception as e:
-            print(f"⚠️ Signet: Chain export failed: {str(e)}")
+            logger.warning("Chain export failed: %s", e)
             return None
     
     def get_verification_summary(self) -> Dict[str, Any]:
@@ -268,7 +745,7 @@ class SignetAutoGenHandler:
         return {
             "trace_id": self.current_trace_id,
             "total_exchanges": len(self.verified_exchanges),
-            "exchanges": self.verified_exchanges,
+            "exchanges": [asdict(ref) for ref in self.verified_exchanges],
             "wrapped_agents": len(self.wrapped_agents)
         }
 
@@ -294,6 +771,26 @@ def create_signet_function(
             }
     """
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                
+                if _is_financial_result(result, func.__name__):
+                    trace_id = f"autogen-func-{uuid.uuid4()}"
+                    payload = _create_signet_payload(result, func.__name__, trace_id, signet_url, api_key, forward_url)
+                    receipt = await _send_to_signet_async(payload, signet_url, api_key)
+                    
+                    if receipt:
+                        logger.debug("Function %r verified (trace: %s)", func.__name__, trace_id)
+                    else:
+                        logger.warning("Function %r verification failed", func.__name__)
+                
+                return result
+            
+            async_wrapper.__name__ = func.__name__
+            async_wrapper.__doc__ = func.__doc__
+            return async_wrapper
+        
         def wrapper(*args, **kwargs):
             # Execute original function
             result = func(*args, **kwargs)
@@ -305,9 +802,9 @@ def create_signet_function(
                 receipt = _send_to_signet(payload, signet_url, api_key)
                 
                 if receipt:
-                    print(f"✅ Signet: Function '{func.__name__}' verified (trace: {trace_id})")
+                    logger.debug("Function %r verified (trace: %s)", func.__name__, trace_id)
                 else:
-                    print(f"❌ Signet: Function '{func.__name__}' verification failed")
+                    logger.warning("Function %r verification failed", func.__name__)
             
             return result
         
@@ -324,27 +821,20 @@ def _is_financial_result(result: Any, func_name: str) -> bool:
     if not isinstance(result, dict):
         return False
     
-    financial_fields = ['amount', 'currency', 'invoice_id', 'payment_id', 'total', 'price']
-    financial_terms = ['invoice', 'payment', 'order', 'transaction', 'receipt']
-    
-    has_financial_fields = any(field in result for field in financial_fields)
-    has_financial_name = any(term in func_name.lower() for term in financial_terms)
-    
-    return has_financial_fields or has_financial_name
+    return _result_name_looks_financial(func_name) or not _RESULT_FIELDS.isdisjoint(result)
 
 
 def _create_signet_payload(result: dict, func_name: str, trace_id: str, signet_url: str, api_key: str, forward_url: Optional[str]) -> dict:
     """Create Signet Protocol payload."""
     return {
-        "payload_type": "openai.tooluse.invoice.v1",
-        "target_type": "invoice.iso20022.v1",
+        **_PAYLOAD_TYPES,
         "trace_id": trace_id,
         "payload": {
             "tool_calls": [{
                 "type": "function",
                 "function": {
                     "name": func_name,
-                    "arguments": json.dumps(result)
+                    "arguments": _dumps(result).decode("utf-8")
                 }
             }]
         },
@@ -357,13 +847,13 @@ def _send_to_signet(payload: dict, signet_url: str, api_key: str) -> Optional[di
     try:
         headers = {
             "X-SIGNET-API-Key": api_key,
-            "X-SIGNET-Idempotency-Key": f"{payload['trace_id']}-{uuid.uuid4()}",
+            "X-SIGNET-Idempotency-Key": f"{payload['trace_id']}-{_ID_PREFIX}-{next(_ID_COUNTER)}",
             "Content-Type": "application/json"
         }
         
-        response = requests.post(
+        response = _SESSION.post(
             f"{signet_url}/v1/exchange",
-            json=payload,
+            data=_dumps(payload),
             headers=headers,
             timeout=30
         )
@@ -376,6 +866,35 @@ def _send_to_signet(payload: dict, signet_url: str, api_key: str) -> Optional[di
         return None
 
 
+async def _send_to_signet_async(payload: dict, signet_url: str, api_key: str, client=None) -> Optional[dict]:
+    """Send to Signet Protocol without blocking the event loop."""
+    if httpx is None:
+        return await asyncio.to_thread(_send_to_signet, payload, signet_url, api_key)
+    
+    if client is None:
+        client = _shared_async_client()
+    
+    try:
+        headers = {
+            "X-SIGNET-API-Key": api_key,
+            "X-SIGNET-Idempotency-Key": f"{payload['trace_id']}-{_ID_PREFIX}-{next(_ID_COUNTER)}",
+            "Content-Type": "application/json"
+        }
+        
+        response = await client.post(
+            f"{signet_url}/v1/exchange",
+            content=_dumps(payload),
+            headers=headers
+        )
+        
+        if response.status_code == 200:
+            return response.json().get("receipt")
+        return None
+        
+    except Exception:
+        return None
+
+
 # Convenience function for quick setup
 def enable_signet_for_autogen(
     signet_url: str,
@@ -408,6 +927,8 @@ if __name__ == "__main__":
     # Example: Using with AutoGen
     import autogen
     
+    logging.basicConfig(level=logging.INFO)
+    
     # Enable Signet verification
     signet_handler = enable_signet_for_autogen(
         signet_url="http://localhost:8088",
@@ -3,14 +3,263 @@ Signet Protocol - CrewAI Integration
 Callback handler for verified AI-to-AI communications in CrewAI.
 """
 
+import asyncio
+import base64
+import functools
+import importlib.util
+import itertools
 import json
+import logging
+import os
+import re
+import threading
 import uuid
+import weakref
 import requests
-from typing import Any, Dict, List, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from crewai.agent import BaseAgent
 from crewai.task import Task
 from crewai.crew import Crew
 
+try:
+    import httpx
+except ImportError:  # httpx is optional; only background verification needs it
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# HTTP/2 multiplexing needs the optional `h2` package alongside httpx
+_HTTP2 = httpx is not None and importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger("signet.crewai")
+
+
+def _term_matcher(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile substring terms into one case-insensitive alternation.
+    
+    A term that contains another term can never decide a match on its own, so
+    it is dropped; extending a table with specific tool names keeps the
+    pattern as small as its distinct keywords.
+    """
+    lowered = {term.lower() for term in terms}
+    kept = sorted(t for t in lowered if not any(o != t and o in t for o in lowered))
+    return re.compile("|".join(map(re.escape, kept)), re.IGNORECASE)
+
+
+# Keyword tables compiled once at import; matching runs in the C regex engine
+_ROUTE_TERMS = (
+    'create_invoice', 'process_payment', 'generate_receipt',
+    'update_invoice', 'create_order', 'process_transaction',
+    'calculate_total', 'apply_discount', 'validate_payment',
+    'invoice', 'payment', 'billing', 'financial'
+)
+_FIN_TERMS = ('invoice', 'payment', 'order', 'transaction', 'receipt', 'billing')
+_RESULT_TERMS = ('invoice', 'payment', 'order', 'transaction', 'receipt')
+
+_ROUTE_TOOL_RE = _term_matcher(_ROUTE_TERMS)
+_FIN_TERM_RE = _term_matcher(_FIN_TERMS)
+_RESULT_TERM_RE = _term_matcher(_RESULT_TERMS)
+
+# frozenset.isdisjoint(dict) checks every field in one C-level pass
+_FIN_FIELDS = frozenset({'amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price'})
+_RESULT_FIELDS = _FIN_FIELDS - {'customer'}
+
+
+@functools.lru_cache(maxsize=1024)
+def _route_tool_name(tool_name: str) -> bool:
+    """Cached routing decision; a crew classifies the same tool names repeatedly."""
+    return _ROUTE_TOOL_RE.search(tool_name) is not None
+
+
+@functools.lru_cache(maxsize=1024)
+def _name_looks_financial(tool_name: str) -> bool:
+    """Cached name half of the financial-data check."""
+    return _FIN_TERM_RE.search(tool_name) is not None
+
+
+@functools.lru_cache(maxsize=1024)
+def _result_name_looks_financial(func_name: str) -> bool:
+    """Cached name half of SignetTool's financial-result check."""
+    return _RESULT_TERM_RE.search(func_name) is not None
+
+
+@dataclass(slots=True)
+class _ToolMeta:
+    """Per-tool facts resolved once at wrap time."""
+    name: str
+    route: bool
+
+
+def _pooled_session(api_key: str) -> requests.Session:
+    """Session with a sized keep-alive pool, retries and the static Signet headers.
+    
+    Retrying POST is safe here: every exchange carries an idempotency key.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"])
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "X-SIGNET-API-Key": api_key,
+        # Every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when installed)
+        "Accept-Encoding": ACCEPT_ENCODING
+    })
+    return session
+
+
+# Handlers talking to the same Signet origin with the same key share one pool
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS = weakref.WeakValueDictionary()
+
+
+def _shared_session(signet_url: str, api_key: str) -> requests.Session:
+    """Process-wide pooled session per (Signet origin, API key), created on first use."""
+    parts = urlsplit(signet_url)
+    key = (parts.scheme, parts.netloc, api_key)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _pooled_session(api_key)
+            _SESSIONS[key] = session
+    return session
+
+
+def _local_uds(signet_url: str) -> Optional[str]:
+    """Unix socket path from SIGNET_UDS, used only when Signet runs on this host."""
+    if urlsplit(signet_url).hostname in ("localhost", "127.0.0.1", "::1"):
+        return os.environ.get("SIGNET_UDS") or None
+    return None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body once, straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or a response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _first_nonspace(text: str, limit: int = 4096) -> str:
+    """First non-whitespace character within `limit` chars, without a stripped copy."""
+    for ch in itertools.islice(text, limit):
+        if not ch.isspace():
+            return ch
+    return ''
+
+
+# Random ids are sliced from one pooled os.urandom read (one syscall per 64 ids)
+_RANDOM_LOCK = threading.Lock()
+_random_pool = memoryview(b"")
+
+
+def _reset_random_pool() -> None:
+    """Drop pooled bytes in a forked child so it cannot reuse the parent's ids."""
+    global _random_pool
+    _random_pool = memoryview(b"")
+
+
+os.register_at_fork(after_in_child=_reset_random_pool)
+
+
+def _random_bytes() -> bytes:
+    """16 random bytes (UUID4-sized) from the pool, refilled when empty."""
+    global _random_pool
+    with _RANDOM_LOCK:
+        if not _random_pool:
+            _random_pool = memoryview(os.urandom(16 * 64))
+        chunk, _random_pool = bytes(_random_pool[:16]), _random_pool[16:]
+    return chunk
+
+
+def _next_id() -> str:
+    """Random 32-character hex id for trace ids."""
+    return _random_bytes().hex()
+
+
+def _key_suffix() -> str:
+    """Compact random idempotency-key suffix: 16 random bytes as unpadded base32."""
+    return base64.b32encode(_random_bytes()).rstrip(b'=').decode('ascii')
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptRef:
+    """The parts of a Signet receipt the handler keeps for the session summary."""
+    hop: Optional[int]
+    receipt_hash: Optional[str]
+    cid: Optional[str]
+    
+    @classmethod
+    def from_receipt(cls, receipt: Dict[str, Any]) -> "ReceiptRef":
+        return cls(receipt.get("hop"), receipt.get("receipt_hash"), receipt.get("cid"))
+
+
+class _SignetAsyncClient:
+    """Pooled httpx client driven by a private event loop on a daemon thread.
+    
+    Sync callers hand it coroutines and get `concurrent.futures.Future`s back,
+    so several exchanges can be in flight while the agent keeps running.
+    """
+    
+    def __init__(self, headers: Dict[str, str], limit: int = 32, uds: Optional[str] = None):
+        self._headers = headers
+        self._limit = limit
+        self._uds = uds
+        self._http = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="signet-async", daemon=True)
+        self._thread.start()
+    
+    @property
+    def http(self):
+        """The shared AsyncClient (created on the loop thread on first use)."""
+        if self._http is None:
+            limits = httpx.Limits(max_connections=self._limit, max_keepalive_connections=self._limit)
+            self._http = httpx.AsyncClient(
+                headers=self._headers,
+                http2=_HTTP2,
+                limits=limits,
+                transport=httpx.AsyncHTTPTransport(uds=self._uds, http2=_HTTP2, limits=limits) if self._uds else None,
+                timeout=30
+            )
+        return self._http
+    
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the client's loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def close(self) -> None:
+        """Close the HTTP client and stop the loop thread."""
+        if self._http is not None:
+            self.submit(self._http.aclose()).result(10)
+            self._http = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop.close()
+
+
 class SignetCrewAIHandler:
     """
     CrewAI integration that routes tool calls through Signet Protocol.
@@ -36,6 +285,10 @@ class SignetCrewAIHandler:
         forward_url: Optional[str] = None,
         tenant: Optional[str] = None,
         auto_forward: bool = True,
+        batch_size: int = 16,
+        batch_sync: bool = False,
+        background: bool = False,
+        export_threshold: int = 1,
         **kwargs
     ):
         self.signet_url = signet_url.rstrip('/')
@@ -43,7 +296,36 @@ class SignetCrewAIHandler:
         self.forward_url = forward_url
         self.tenant = tenant or "crewai"
         self.auto_forward = auto_forward
-        self.session = requests.Session()
+        self.export_threshold = export_threshold
+        self.batch_size = batch_size
+        self.batch_sync = batch_sync
+        self.session = _shared_session(self.signet_url, api_key)
+        
+        # Static part of every exchange payload, built once
+        self._payload_template = {
+            "payload_type": "openai.tooluse.invoice.v1",
+            "target_type": "invoice.iso20022.v1",
+            "forward_url": self.forward_url if self.auto_forward else None
+        }
+        
+        # (idempotency key, payload) pairs awaiting one /v1/exchange:batch POST
+        self._pending = []
+        
+        # Background verification: exchanges run on an event loop thread (httpx)
+        # or a small worker pool, and are collected into verified_exchanges later
+        self.background = background
+        self._inflight = deque()
+        self._lock = threading.Lock()
+        self._async_client = None
+        self._pool = None
+        self._export_future = None
+        if background and httpx is not None:
+            self._async_client = _SignetAsyncClient(
+                {"Content-Type": "application/json", "X-SIGNET-API-Key": api_key},
+                uds=_local_uds(self.signet_url)
+            )
+        elif background:
+            self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="signet")
         
         # Track current trace for chaining
         self.current_trace_id = None
@@ -56,7 +338,7 @@ class SignetCrewAIHandler:
         self.crew = crew
         
         # Generate trace ID for this crew session
-        self.current_trace_id = f"crewai-{uuid.uuid4()}"
+        self.current_trace_id = f"crewai-{_next_id()}"
         
         # Wrap all agents in the crew
         for agent in crew.agents:
@@ -66,20 +348,26 @@ class SignetCrewAIHandler:
         original_kickoff = crew.kickoff
         
         def wrapped_kickoff(*args, **kwargs):
-            print(f"🔗 Signet: CrewAI session starting (trace: {self.current_trace_id})")
+            logger.info("CrewAI session starting (trace: %s)", self.current_trace_id)
             
             try:
                 result = original_kickoff(*args, **kwargs)
                 
+                # Send exchanges still queued for batching, then gather background ones
+                self._flush()
+                self._collect()
+                
                 # Session completed - export chain if we have exchanges
                 if self.verified_exchanges:
-                    print(f"🏁 Signet: CrewAI session complete - {len(self.verified_exchanges)} verified exchanges")
+                    logger.info("CrewAI session complete - %d verified exchanges", len(self.verified_exchanges))
                     self._export_chain()
                 
                 return result
             
             except Exception as e:
-                print(f"⚠️ Signet: CrewAI session error: {str(e)}")
+                self._flush()
+                self._collect()
+                logger.warning("CrewAI session error: %s", e)
                 raise
         
         crew.kickoff = wrapped_kickoff
@@ -94,17 +382,8 @@ class SignetCrewAIHandler:
     
     def _should_route_tool(self, tool) -> bool:
         """Determine if a tool should be routed through Signet."""
-        tool_name = getattr(tool, 'name', str(tool)).lower()
-        
         # Route financial/invoice/data processing tools through Signet
-        signet_tools = [
-            'create_invoice', 'process_payment', 'generate_receipt',
-            'update_invoice', 'create_order', 'process_transaction',
-            'calculate_total', 'apply_discount', 'validate_payment',
-            'invoice', 'payment', 'billing', 'financial'
-        ]
-        
-        return any(signet_tool in tool_name for signet_tool in signet_tools)
+        return _route_tool_name(getattr(tool, 'name', str(tool)))
     
     def _wrap_tool(self, original_tool):
         """Wrap a tool to route its output through Signet Protocol."""
@@ -121,30 +400,9 @@ class SignetCrewAIHandler:
             # Can't wrap this tool
             return original_tool
         
-        def wrapped_run(*args, **kwargs):
-            tool_name = getattr(original_tool, 'name', 'unknown_tool')
-            print(f"🎯 Signet: Routing tool '{tool_name}' through protocol")
-            
-            try:
-                # Execute original tool
-                result = original_run(*args, **kwargs)
-                
-                # Parse and route through Signet
-                parsed_output = self._parse_tool_output(result, tool_name, args, kwargs)
-                
-                if parsed_output:
-                    receipt = self._send_to_signet(parsed_output)
-                    if receipt:
-                        self.verified_exchanges.append(receipt)
-                        print(f"✅ Signet: Verified exchange recorded (hop: {receipt.get('hop')})")
-                    else:
-                        print("❌ Signet: Exchange verification failed")
-                
-                return result
-            
-            except Exception as e:
-                print(f"⚠️ Signet: Error in wrapped tool: {str(e)}")
-                raise
+        # One shared dispatcher; per-tool state travels in the partial's slots meta
+        meta = _ToolMeta(getattr(original_tool, 'name', 'unknown_tool'), self._should_route_tool(original_tool))
+        wrapped_run = functools.partial(self._dispatch, meta, original_run)
         
         # Replace the run method
         if hasattr(original_tool, '_run'):
@@ -154,6 +412,39 @@ class SignetCrewAIHandler:
         
         return original_tool
     
+    def _dispatch(self, meta: _ToolMeta, original_run: Callable, *args, **kwargs) -> Any:
+        """Run a wrapped tool and route its output through Signet Protocol."""
+        tool_name = meta.name
+        logger.debug("Routing tool %r through protocol", tool_name)
+        
+        try:
+            # Execute original tool
+            result = original_run(*args, **kwargs)
+            if not meta.route:
+                return result
+            
+            # Parse and route through Signet
+            parsed_output = self._parse_tool_output(result, tool_name, args, kwargs)
+            
+            if parsed_output and self.batch_sync:
+                self._queue_exchange(parsed_output)
+            elif parsed_output and self.background:
+                self._submit_exchange(parsed_output)
+            elif parsed_output:
+                receipt = self._send_to_signet(parsed_output)
+                if receipt:
+                    with self._lock:
+                        self.verified_exchanges.append(ReceiptRef.from_receipt(receipt))
+                    logger.debug("Verified exchange recorded (hop: %s)", receipt.get('hop'))
+                else:
+                    logger.warning("Exchange verification failed for %r", tool_name)
+            
+            return result
+        
+        except Exception as e:
+            logger.warning("Error in wrapped tool %r: %s", tool_name, e)
+            raise
+    
     def _parse_tool_output(
         self, 
         output: Any, 
@@ -163,9 +454,13 @@ class SignetCrewAIHandler:
     ) -> Optional[Dict[str, Any]]:
         """Parse tool output to extract structured data suitable for Signet."""
         try:
+            # JSON text the data was decoded from, reused verbatim as the arguments
+            arguments = None
+            
             # Try to parse output as JSON first
-            if isinstance(output, str) and output.strip().startswith('{'):
-                data = json.loads(output)
+            if isinstance(output, str) and _first_nonspace(output) == '{':
+                data = _loads(output)
+                arguments = output
             elif isinstance(output, dict):
                 data = output
             else:
@@ -181,7 +476,7 @@ class SignetCrewAIHandler:
             
             # Check if it looks like financial data
             if self._is_financial_data(data, tool_name):
-                return self._convert_to_signet_payload(data, tool_name)
+                return self._convert_to_signet_payload(data, tool_name, arguments)
             
             return None
             
@@ -190,79 +485,208 @@ class SignetCrewAIHandler:
     
     def _is_financial_data(self, data: Dict[str, Any], tool_name: str) -> bool:
         """Check if data structure looks like financial/invoice data."""
-        financial_fields = ['amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price']
-        financial_terms = ['invoice', 'payment', 'order', 'transaction', 'receipt', 'billing']
-        
-        # Check if data contains financial fields
-        has_financial_fields = any(field in data for field in financial_fields)
-        
-        # Check if tool name suggests financial operation
-        has_financial_tool = any(term in tool_name.lower() for term in financial_terms)
-        
-        return has_financial_fields or has_financial_tool
+        # Tool name suggesting a financial operation (a cache hit for recurring
+        # tools, so it goes first and can skip the key scan), or financial fields
+        return _name_looks_financial(tool_name) or not _FIN_FIELDS.isdisjoint(data)
     
-    def _convert_to_signet_payload(self, data: Dict[str, Any], tool_name: str) -> Dict[str, Any]:
-        """Convert parsed data to Signet Protocol payload format."""
-        return {
-            "payload_type": "openai.tooluse.invoice.v1",
-            "target_type": "invoice.iso20022.v1",
-            "trace_id": self.current_trace_id,
-            "payload": {
-                "tool_calls": [{
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "arguments": json.dumps(data)
-                    }
-                }]
-            },
-            "forward_url": self.forward_url if self.auto_forward else None
+    def _convert_to_signet_payload(
+        self,
+        data: Dict[str, Any],
+        tool_name: str,
+        arguments: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Convert parsed data to Signet Protocol payload format.
+        
+        `arguments` is the JSON text `data` was decoded from, when available.
+        """
+        payload = self._payload_template.copy()
+        payload["trace_id"] = self.current_trace_id
+        payload["payload"] = {
+            "tool_calls": [{
+                "type": "function",
+                "function": {
+                    "name": tool_name,
+                    "arguments": arguments if arguments is not None else _dumps(data).decode("utf-8")
+                }
+            }]
         }
+        return payload
+    
+    def _next_idempotency_key(self) -> str:
+        """Trace-scoped idempotency key with a compact random suffix."""
+        return f"{self.current_trace_id}-{_key_suffix()}"
     
     def _send_to_signet(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Send payload to Signet Protocol for verification."""
         try:
-            headers = {
-                "X-SIGNET-API-Key": self.api_key,
-                "X-SIGNET-Idempotency-Key": f"{self.current_trace_id}-{uuid.uuid4()}",
-                "Content-Type": "application/json"
-            }
+            headers = {"X-SIGNET-Idempotency-Key": self._next_idempotency_key()}
             
             response = self.session.post(
                 f"{self.signet_url}/v1/exchange",
-                json=payload,
+                data=_dumps(payload),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = _loads(response.content)
                 return result.get("receipt")
             else:
-                print(f"❌ Signet API error: {response.status_code} - {response.text}")
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ Signet request failed: {str(e)}")
+            logger.warning("Signet request failed: %s", e)
+            return None
+    
+    def _queue_exchange(self, payload: Dict[str, Any]) -> None:
+        """Queue an exchange; flush once `batch_size` items are pending."""
+        key = self._next_idempotency_key()
+        with self._lock:
+            self._pending.append((key, payload))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._flush()
+    
+    def _flush(self) -> int:
+        """Send queued exchanges now. Returns the number of receipts recorded."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        
+        receipts = [receipt for receipt in self._send_batch(batch) if receipt]
+        with self._lock:
+            self.verified_exchanges.extend(map(ReceiptRef.from_receipt, receipts))
+        logger.debug("Batch verified %d/%d exchanges", len(receipts), len(batch))
+        return len(receipts)
+    
+    def _send_batch(self, batch: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+        """POST queued exchanges in one request; one receipt (or None) per item."""
+        try:
+            response = self.session.post(
+                f"{self.signet_url}/v1/exchange:batch",
+                data=_dumps({"exchanges": [{**payload, "idempotency_key": key} for key, payload in batch]}),
+                timeout=30
+            )
+            
+            if response.status_code == 404:
+                # Server predates the batch route: send one by one on the pooled connection
+                return [self._send_to_signet(payload) for _, payload in batch]
+            if response.status_code != 200:
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+                return [None] * len(batch)
+            
+            # Correlate results by the idempotency key each exchange was sent with
+            results = {item.get("idempotency_key"): item for item in _loads(response.content).get("results", [])}
+            return [
+                (results[key].get("response") or {}).get("receipt")
+                if key in results and results[key].get("status_code") == 200 else None
+                for key, _ in batch
+            ]
+        
+        except Exception as e:
+            logger.warning("Signet batch request failed: %s", e)
+            return [None] * len(batch)
+    
+    async def _send_to_signet_async(self, payload: Dict[str, Any], idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """Awaitable `_send_to_signet`, run on the background client's loop."""
+        try:
+            response = await self._async_client.http.post(
+                f"{self.signet_url}/v1/exchange",
+                content=_dumps(payload),
+                headers={"X-SIGNET-Idempotency-Key": idempotency_key}
+            )
+            
+            if response.status_code == 200:
+                return _loads(response.content).get("receipt")
+            logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+            return None
+        
+        except Exception as e:
+            logger.warning("Signet request failed: %s", e)
             return None
     
-    def _export_chain(self) -> None:
-        """Export the complete receipt chain."""
-        if not self.current_trace_id:
-            return
+    def _submit_exchange(self, payload: Dict[str, Any]) -> None:
+        """Start verifying an exchange in the background and return at once; see `_collect`."""
+        if self._async_client is not None:
+            key = self._next_idempotency_key()
+            future = self._async_client.submit(self._send_to_signet_async(payload, key))
+        else:
+            future = self._pool.submit(self._send_to_signet, payload)
+        with self._lock:
+            self._inflight.append(future)
+    
+    def _collect(self, timeout: float = 30) -> int:
+        """Wait for background exchanges and record their receipts."""
+        with self._lock:
+            inflight, self._inflight = self._inflight, deque()
+        if not inflight:
+            return 0
+        
+        done, not_done = wait(inflight, timeout=timeout)
+        receipts = [receipt for receipt in (future.result() for future in done) if receipt]
+        with self._lock:
+            self.verified_exchanges.extend(map(ReceiptRef.from_receipt, receipts))
+        if not_done:
+            logger.warning("%d exchanges still pending after %ss", len(not_done), timeout)
+        logger.debug("Verified %d/%d background exchanges", len(receipts), len(inflight))
+        return len(receipts)
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created on first use if background sends did not need it."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="signet")
+            return self._pool
+    
+    def close(self) -> None:
+        """Collect background exchanges and stop the background client or pool."""
+        self._collect()
+        if self._async_client is not None:
+            self._async_client.close()
+            self._async_client = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    def _export_chain(self) -> Optional[Future]:
+        """Export the complete receipt chain on a worker thread; see `wait_for_export`.
         
+        Skipped below `export_threshold` verified exchanges.
+        """
+        if not self.current_trace_id or len(self.verified_exchanges) < self.export_threshold:
+            return None
+        
+        self._export_future = self._executor().submit(
+            self._do_export, self.current_trace_id, len(self.verified_exchanges)
+        )
+        return self._export_future
+    
+    def _do_export(self, trace_id: str, count: int) -> bool:
+        """Request the chain export; only the status is needed, so the body is not read."""
         try:
             response = self.session.get(
-                f"{self.signet_url}/v1/receipts/export/{self.current_trace_id}",
-                timeout=10
+                f"{self.signet_url}/v1/receipts/export/{trace_id}",
+                timeout=10,
+                stream=True
             )
+            response.close()
             
             if response.status_code == 200:
-                print(f"📤 Signet: Chain exported - {len(self.verified_exchanges)} receipts")
+                logger.info("Chain exported - %d receipts", count)
                 # Optionally save to file or send to webhook
+                return True
             
         except Exception as e:
-            print(f"⚠️ Signet: Chain export failed: {str(e)}")
+            logger.warning("Chain export failed: %s", e)
+        return False
+    
+    def wait_for_export(self, timeout: Optional[float] = None) -> bool:
+        """Block until the last chain export finishes; True if it succeeded."""
+        if self._export_future is None:
+            return False
+        return self._export_future.result(timeout)
 
 
 class SignetTool:
@@ -296,13 +720,18 @@ class SignetTool:
         self.api_key = api_key
         self.forward_url = forward_url
         self.tenant = tenant or "crewai-tool"
-        self.session = requests.Session()
+        self.session = _shared_session(self.signet_url, api_key)
+        self._payload_template = {
+            "payload_type": "openai.tooluse.invoice.v1",
+            "target_type": "invoice.iso20022.v1",
+            "forward_url": forward_url
+        }
     
     def __call__(self, func):
         """Decorator to wrap a function as a Signet-enabled tool."""
         def wrapper(*args, **kwargs):
             # Generate trace ID for this tool call
-            trace_id = f"{self.tenant}-{uuid.uuid4()}"
+            trace_id = f"{self.tenant}-{_next_id()}"
             
             # Execute original function
             result = func(*args, **kwargs)
@@ -313,9 +742,9 @@ class SignetTool:
                 receipt = self._send_to_signet(payload)
                 
                 if receipt:
-                    print(f"✅ Signet: Tool '{func.__name__}' verified (trace: {trace_id})")
+                    logger.debug("Tool %r verified (trace: %s)", func.__name__, trace_id)
                 else:
-                    print(f"❌ Signet: Tool '{func.__name__}' verification failed")
+                    logger.warning("Tool %r verification failed", func.__name__)
             
             return result
         
@@ -329,50 +758,37 @@ class SignetTool:
         if not isinstance(result, dict):
             return False
         
-        financial_fields = ['amount', 'currency', 'invoice_id', 'payment_id', 'total', 'price']
-        financial_terms = ['invoice', 'payment', 'order', 'transaction', 'receipt']
-        
-        has_financial_fields = any(field in result for field in financial_fields)
-        has_financial_name = any(term in func_name.lower() for term in financial_terms)
-        
-        return has_financial_fields or has_financial_name
+        return _result_name_looks_financial(func_name) or not _RESULT_FIELDS.isdisjoint(result)
     
     def _create_signet_payload(self, result: dict, func_name: str, trace_id: str) -> dict:
         """Create Signet Protocol payload."""
-        return {
-            "payload_type": "openai.tooluse.invoice.v1",
-            "target_type": "invoice.iso20022.v1",
-            "trace_id": trace_id,
-            "payload": {
-                "tool_calls": [{
-                    "type": "function",
-                    "function": {
-                        "name": func_name,
-                        "arguments": json.dumps(result)
-                    }
-                }]
-            },
-            "forward_url": self.forward_url
+        payload = self._payload_template.copy()
+        payload["trace_id"] = trace_id
+        payload["payload"] = {
+            "tool_calls": [{
+                "type": "function",
+                "function": {
+                    "name": func_name,
+                    "arguments": _dumps(result).decode("utf-8")
+                }
+            }]
         }
+        return payload
     
     def _send_to_signet(self, payload: dict) -> Optional[dict]:
         """Send to Signet Protocol."""
         try:
-            headers = {
-                "X-SIGNET-API-Key": self.api_key,
-                "X-SIGNET-Idempotency-Key": f"{payload['trace_id']}-{uuid.uuid4()}",
-                "Content-Type": "application/json"
-            }
+            headers = {"X-SIGNET-Idempotency-Key": f"{payload['trace_id']}-{_key_suffix()}"}
             
             response = self.session.post(
                 f"{self.signet_url}/v1/exchange",
-                json=payload,
+                data=_dumps(payload),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                return response.json().get("receipt")
+                return _loads(response.content).get("receipt")
             return None
             
         except Exception:
@@ -411,6 +827,8 @@ if __name__ == "__main__":
     # Example: Using with CrewAI
     from crewai import Agent, Task, Crew, Process
     
+    logging.basicConfig(level=logging.INFO)
+    
     # Enable Signet verification
     signet_handler = enable_signet_for_crewai(
         signet_url="http://localhost:8088",
@@ -23,14 +23,248 @@ Signet Protocol - LangChain Integration
 One-line callback handler for verified AI-to-AI communications.
 """
 
+import asyncio
+import base64
+import hashlib
+import importlib.util
 import json
-import uuid
+import logging
+import os
+import threading
+import time
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from urllib.parse import urlsplit
 from typing import Any, Dict, List, Optional, Union
 from langchain.callbacks.base import BaseCallbackHandler
 from langchain.schema import AgentAction, AgentFinish, LLMResult
 from langchain.schema.messages import BaseMessage
 
+try:
+    import httpx
+except ImportError:  # httpx is optional; only background verification needs it
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# HTTP/2 multiplexing needs the optional `h2` package alongside httpx
+_HTTP2 = httpx is not None and importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger("signet.langchain")
+
+# Shared decoder for scanning tool output with raw_decode
+_DECODER = json.JSONDecoder()
+
+# Lookup tables are frozensets: isdisjoint(dict) and membership run in C
+_INVOICE_FIELDS = frozenset({'amount', 'currency', 'invoice_id', 'customer', 'description'})
+_SIGNET_TOOLS = frozenset({'create_invoice', 'process_payment', 'generate_receipt'})
+
+
+def _pooled_session(api_key: str) -> requests.Session:
+    """Session with a sized keep-alive pool, retries and the static Signet headers.
+    
+    Retrying POST is safe here: every exchange carries an idempotency key.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"])
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "X-SIGNET-API-Key": api_key,
+        # Every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when installed)
+        "Accept-Encoding": ACCEPT_ENCODING
+    })
+    return session
+
+
+# Handlers talking to the same Signet origin with the same key share one pool
+_SESSIONS_LOCK = threading.Lock()
+_SESSIONS = weakref.WeakValueDictionary()
+
+
+def _shared_session(signet_url: str, api_key: str) -> requests.Session:
+    """Process-wide pooled session per (Signet origin, API key), created on first use."""
+    parts = urlsplit(signet_url)
+    key = (parts.scheme, parts.netloc, api_key)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _pooled_session(api_key)
+            _SESSIONS[key] = session
+    return session
+
+
+def _local_uds(signet_url: str) -> Optional[str]:
+    """Unix socket path from SIGNET_UDS, used only when Signet runs on this host."""
+    if urlsplit(signet_url).hostname in ("localhost", "127.0.0.1", "::1"):
+        return os.environ.get("SIGNET_UDS") or None
+    return None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body once, straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or a response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Random ids are sliced from one pooled os.urandom read (one syscall per 64 ids)
+_RANDOM_LOCK = threading.Lock()
+_random_pool = memoryview(b"")
+
+
+def _reset_random_pool() -> None:
+    """Drop pooled bytes in a forked child so it cannot reuse the parent's ids."""
+    global _random_pool
+    _random_pool = memoryview(b"")
+
+
+os.register_at_fork(after_in_child=_reset_random_pool)
+
+
+def _random_bytes() -> bytes:
+    """16 random bytes (UUID4-sized) from the pool, refilled when empty."""
+    global _random_pool
+    with _RANDOM_LOCK:
+        if not _random_pool:
+            _random_pool = memoryview(os.urandom(16 * 64))
+        chunk, _random_pool = bytes(_random_pool[:16]), _random_pool[16:]
+    return chunk
+
+
+def _next_id() -> str:
+    """Random 32-character hex id for trace ids."""
+    return _random_bytes().hex()
+
+
+def _key_suffix() -> str:
+    """Compact random idempotency-key suffix: 16 random bytes as unpadded base32."""
+    return base64.b32encode(_random_bytes()).rstrip(b'=').decode('ascii')
+
+
+def _build_tooluse_payload(name: str, arguments_json: str) -> Dict[str, Any]:
+    """The `payload` body of an exchange: one function tool call."""
+    return {"tool_calls": [{"type": "function", "function": {"name": name, "arguments": arguments_json}}]}
+
+
+def _content_digest(payload: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON form of a payload (sorted keys, no whitespace)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _RecentReceipts:
+    """Receipts of recently verified payloads, keyed by content digest.
+    
+    Bounded LRU with a TTL: a retried or replayed callback carrying the same
+    payload gets the earlier receipt back without another round trip.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(digest)
+            if entry is None:
+                return None
+            receipt, stored_at = entry
+            if time.monotonic() - stored_at >= self._ttl:
+                del self._items[digest]
+                return None
+            self._items.move_to_end(digest)
+            return receipt
+    
+    def put(self, digest: str, receipt: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[digest] = (receipt, time.monotonic())
+            self._items.move_to_end(digest)
+            if len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptRef:
+    """The parts of a Signet receipt the handler keeps for the session summary."""
+    hop: Optional[int]
+    receipt_hash: Optional[str]
+    cid: Optional[str]
+    
+    @classmethod
+    def from_receipt(cls, receipt: Dict[str, Any]) -> "ReceiptRef":
+        return cls(receipt.get("hop"), receipt.get("receipt_hash"), receipt.get("cid"))
+
+
+class _SignetAsyncClient:
+    """Pooled httpx client driven by a private event loop on a daemon thread.
+    
+    Sync callers hand it coroutines and get `concurrent.futures.Future`s back,
+    so several exchanges can be in flight while the agent keeps running.
+    """
+    
+    def __init__(self, headers: Dict[str, str], limit: int = 32, uds: Optional[str] = None):
+        self._headers = headers
+        self._limit = limit
+        self._uds = uds
+        self._http = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="signet-async", daemon=True)
+        self._thread.start()
+    
+    @property
+    def http(self):
+        """The shared AsyncClient (created on the loop thread on first use)."""
+        if self._http is None:
+            limits = httpx.Limits(max_connections=self._limit, max_keepalive_connections=self._limit)
+            self._http = httpx.AsyncClient(
+                headers=self._headers,
+                http2=_HTTP2,
+                limits=limits,
+                transport=httpx.AsyncHTTPTransport(uds=self._uds, http2=_HTTP2, limits=limits) if self._uds else None,
+                timeout=30
+            )
+        return self._http
+    
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the client's loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def close(self) -> None:
+        """Close the HTTP client and stop the loop thread."""
+        if self._http is not None:
+            self.submit(self._http.aclose()).result(10)
+            self._http = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop.close()
+
+
 class SignetCallbackHandler(BaseCallbackHandler):
     """
     LangChain callback handler that routes tool calls through Signet Protocol.
@@ -48,6 +282,9 @@ class SignetCallbackHandler(BaseCallbackHandler):
         chain.run(input_text, callbacks=[signet_handler])
     """
     
+    # Tool outputs above this size (e.g. whole LLM transcripts) are not scanned for JSON
+    max_output_chars = 1 << 20
+    
     def __init__(
         self,
         signet_url: str,
@@ -55,6 +292,12 @@ class SignetCallbackHandler(BaseCallbackHandler):
         forward_url: Optional[str] = None,
         tenant: Optional[str] = None,
         auto_forward: bool = True,
+        batch_size: int = 16,
+        batch_sync: bool = False,
+        background: bool = False,
+        export_threshold: int = 2,
+        max_receipts: int = 10_000,
+        max_concurrent: int = 16,
         **kwargs
     ):
         super().__init__(**kwargs)
@@ -63,11 +306,45 @@ class SignetCallbackHandler(BaseCallbackHandler):
         self.forward_url = forward_url
         self.tenant = tenant or "langchain"
         self.auto_forward = auto_forward
-        self.session = requests.Session()
+        self.export_threshold = export_threshold
+        self.batch_size = batch_size
+        self.batch_sync = batch_sync
+        self.session = _shared_session(self.signet_url, api_key)
         
-        # Track current trace for chaining
+        # Static part of every exchange payload, built once
+        self._payload_template = {
+            "payload_type": "openai.tooluse.invoice.v1",
+            "target_type": "invoice.iso20022.v1",
+            "forward_url": self.forward_url if self.auto_forward else None
+        }
+        
+        # (idempotency key, payload) pairs awaiting one /v1/exchange:batch POST
+        self._pending = []
+        
+        # Background verification: exchanges run on an event loop thread (httpx)
+        # or a small worker pool, and are collected into verified_exchanges later.
+        # At most max_concurrent are on the wire at once; the rest wait their turn.
+        self.background = background
+        self._send_slots = asyncio.Semaphore(max_concurrent)
+        self._inflight = deque()
+        self._lock = threading.Lock()
+        self._async_client = None
+        self._pool = None
+        self._export_future = None
+        if background and httpx is not None:
+            self._async_client = _SignetAsyncClient(
+                {"Content-Type": "application/json", "X-SIGNET-API-Key": api_key},
+                uds=_local_uds(self.signet_url)
+            )
+        elif background:
+            self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="signet")
+        
+        # Receipts of recent single sends, so identical payloads are not re-verified
+        self._recent = _RecentReceipts()
+        
+        # Track current trace for chaining; only the newest max_receipts are kept
         self.current_trace_id = None
-        self.verified_exchanges = []
+        self.verified_exchanges = deque(maxlen=max_receipts)
     
     def on_tool_start(
         self,
@@ -78,11 +355,13 @@ class SignetCallbackHandler(BaseCallbackHandler):
         """Called when a tool starts running."""
         tool_name = serialized.get("name", "unknown_tool")
         
-        # Generate trace ID for new conversation
+        # Generate trace ID for new conversation; parallel tools must agree on one
         if not self.current_trace_id:
-            self.current_trace_id = f"langchain-{uuid.uuid4()}"
+            with self._lock:
+                if not self.current_trace_id:
+                    self.current_trace_id = f"langchain-{_next_id()}"
         
-        print(f"🔗 Signet: Tool '{tool_name}' starting (trace: {self.current_trace_id})")
+        logger.debug("Tool %r starting (trace: %s)", tool_name, self.current_trace_id)
     
     def on_tool_end(
         self,
@@ -94,17 +373,22 @@ class SignetCallbackHandler(BaseCallbackHandler):
             # Parse tool output as potential invoice/structured data
             tool_output = self._parse_tool_output(output)
             
-            if tool_output:
+            if tool_output and self.batch_sync:
+                self._queue_exchange(tool_output)
+            elif tool_output and self.background:
+                self._submit_exchange(tool_output)
+            elif tool_output:
                 # Route through Signet Protocol
                 receipt = self._send_to_signet(tool_output)
                 if receipt:
-                    self.verified_exchanges.append(receipt)
-                    print(f"✅ Signet: Verified exchange recorded (hop: {receipt.get('hop')})")
+                    with self._lock:
+                        self.verified_exchanges.append(ReceiptRef.from_receipt(receipt))
+                    logger.debug("Verified exchange recorded (hop: %s)", receipt.get('hop'))
                 else:
-                    print("❌ Signet: Exchange verification failed")
+                    logger.warning("Exchange verification failed")
         
         except Exception as e:
-            print(f"⚠️ Signet: Error processing tool output: {str(e)}")
+            logger.warning("Error processing tool output: %s", e)
     
     def on_agent_action(
         self,
@@ -114,7 +398,7 @@ class SignetCallbackHandler(BaseCallbackHandler):
         """Called when agent takes an action."""
         # Check if this is a tool call that should go through Signet
         if self._should_route_through_signet(action):
-            print(f"🎯 Signet: Routing agent action '{action.tool}' through protocol")
+            logger.debug("Routing agent action %r through protocol", action.tool)
     
     def on_agent_finish(
         self,
@@ -122,12 +406,15 @@ class SignetCallbackHandler(BaseCallbackHandler):
         **kwargs: Any,
     ) -> None:
         """Called when agent finishes."""
+        # Send exchanges still queued for batching, then gather background ones
+        self._flush()
+        self._collect()
+        
         if self.verified_exchanges:
-            print(f"🏁 Signet: Session complete - {len(self.verified_exchanges)} verified exchanges")
+            logger.info("Session complete - %d verified exchanges", len(self.verified_exchanges))
             
-            # Optionally export the complete chain
-            if len(self.verified_exchanges) > 1:
-                self._export_chain()
+            # Export the complete chain once it reaches export_threshold
+            self._export_chain()
     
     def on_llm_end(
         self,
@@ -139,112 +426,248 @@ class SignetCallbackHandler(BaseCallbackHandler):
         for generation in response.generations:
             for gen in generation:
                 if self._contains_structured_data(gen.text):
-                    print("📋 Signet: LLM generated structured data - considering for verification")
+                    logger.debug("LLM generated structured data - considering for verification")
     
     def _parse_tool_output(self, output: str) -> Optional[Dict[str, Any]]:
         """
         Parse tool output to extract structured data suitable for Signet.
         Override this method to customize parsing for your use case.
+        Outputs longer than `max_output_chars` are skipped without scanning.
         """
-        try:
-            # Try to parse as JSON first
-            if output.strip().startswith('{'):
-                data = json.loads(output)
-                
-                # Check if it looks like invoice data
-                if self._is_invoice_like(data):
-                    return self._convert_to_signet_payload(data)
-            
-            # Try to extract JSON from text
-            import re
-            json_match = re.search(r'\{[^{}]*\}', output)
-            if json_match:
-                data = json.loads(json_match.group())
-                if self._is_invoice_like(data):
-                    return self._convert_to_signet_payload(data)
-            
+        if not isinstance(output, str) or len(output) > self.max_output_chars:
             return None
+        
+        # Decode the first complete JSON object, nested or not, starting at each '{'
+        start = output.find('{')
+        while start != -1:
+            try:
+                data, end = _DECODER.raw_decode(output, start)
+            except json.JSONDecodeError:
+                start = output.find('{', start + 1)
+                continue
             
-        except (json.JSONDecodeError, Exception):
+            # Check if it looks like invoice data; the decoded slice is already
+            # valid JSON, so it becomes the arguments without re-encoding
+            if self._is_invoice_like(data):
+                return self._convert_to_signet_payload(data, output[start:end])
             return None
+        
+        return None
     
     def _is_invoice_like(self, data: Dict[str, Any]) -> bool:
         """Check if data structure looks like an invoice."""
-        invoice_fields = ['amount', 'currency', 'invoice_id', 'customer', 'description']
-        return any(field in data for field in invoice_fields)
+        return not _INVOICE_FIELDS.isdisjoint(data)
     
-    def _convert_to_signet_payload(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert parsed data to Signet Protocol payload format."""
-        return {
-            "payload_type": "openai.tooluse.invoice.v1",
-            "target_type": "invoice.iso20022.v1",
-            "trace_id": self.current_trace_id,
-            "payload": {
-                "tool_calls": [{
-                    "type": "function",
-                    "function": {
-                        "name": "create_invoice",
-                        "arguments": json.dumps(data)
-                    }
-                }]
-            },
-            "forward_url": self.forward_url if self.auto_forward else None
-        }
+    def _convert_to_signet_payload(self, data: Dict[str, Any], arguments: Optional[str] = None) -> Dict[str, Any]:
+        """Convert parsed data to Signet Protocol payload format.
+        
+        `arguments` is the JSON text `data` was decoded from, when available.
+        """
+        payload = self._payload_template.copy()
+        payload["trace_id"] = self.current_trace_id
+        payload["payload"] = _build_tooluse_payload(
+            "create_invoice",
+            arguments if arguments is not None else _dumps(data).decode("utf-8")
+        )
+        return payload
+    
+    def _next_idempotency_key(self) -> str:
+        """Trace-scoped idempotency key with a compact random suffix."""
+        return f"{self.current_trace_id}-{_key_suffix()}"
     
     def _send_to_signet(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Send payload to Signet Protocol for verification."""
+        """Send payload to Signet Protocol for verification.
+        
+        The idempotency key is the payload's content digest, so a repeated
+        payload replays its receipt; within the TTL it is answered locally.
+        """
         try:
-            headers = {
-                "X-SIGNET-API-Key": self.api_key,
-                "X-SIGNET-Idempotency-Key": f"{self.current_trace_id}-{uuid.uuid4()}",
-                "Content-Type": "application/json"
-            }
+            digest = _content_digest(payload)
+            cached = self._recent.get(digest)
+            if cached is not None:
+                logger.debug("Reusing receipt for repeated payload %s", digest)
+                return cached
+            
+            headers = {"X-SIGNET-Idempotency-Key": f"sha256:{digest}"}
             
             response = self.session.post(
                 f"{self.signet_url}/v1/exchange",
-                json=payload,
+                data=_dumps(payload),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
-                return result.get("receipt")
+                result = _loads(response.content)
+                receipt = result.get("receipt")
+                if receipt:
+                    self._recent.put(digest, receipt)
+                return receipt
             else:
-                print(f"❌ Signet API error: {response.status_code} - {response.text}")
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ Signet request failed: {str(e)}")
+            logger.warning("Signet request failed: %s", e)
             return None
     
+    def _queue_exchange(self, payload: Dict[str, Any]) -> None:
+        """Queue an exchange; flush once `batch_size` items are pending."""
+        with self._lock:
+            self._pending.append((self._next_idempotency_key(), payload))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._flush()
+    
+    def _flush(self) -> int:
+        """Send queued exchanges now. Returns the number of receipts recorded."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        
+        receipts = [receipt for receipt in self._send_batch(batch) if receipt]
+        with self._lock:
+            self.verified_exchanges.extend(map(ReceiptRef.from_receipt, receipts))
+        logger.debug("Batch verified %d/%d exchanges", len(receipts), len(batch))
+        return len(receipts)
+    
+    def _send_batch(self, batch: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+        """POST queued exchanges in one request; one receipt (or None) per item."""
+        try:
+            response = self.session.post(
+                f"{self.signet_url}/v1/exchange:batch",
+                data=_dumps({"exchanges": [{**payload, "idempotency_key": key} for key, payload in batch]}),
+                timeout=30
+            )
+            
+            if response.status_code == 404:
+                # Server predates the batch route: send one by one on the pooled connection
+                return [self._send_to_signet(payload) for _, payload in batch]
+            if response.status_code != 200:
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+                return [None] * len(batch)
+            
+            # Correlate results by the idempotency key each exchange was sent with
+            results = {item.get("idempotency_key"): item for item in _loads(response.content).get("results", [])}
+            return [
+                (results[key].get("response") or {}).get("receipt")
+                if key in results and results[key].get("status_code") == 200 else None
+                for key, _ in batch
+            ]
+        
+        except Exception as e:
+            logger.warning("Signet batch request failed: %s", e)
+            return [None] * len(batch)
+    
+    async def _send_to_signet_async(self, payload: Dict[str, Any], idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """Awaitable `_send_to_signet`, run on the background client's loop."""
+        try:
+            async with self._send_slots:
+                response = await self._async_client.http.post(
+                    f"{self.signet_url}/v1/exchange",
+                    content=_dumps(payload),
+                    headers={"X-SIGNET-Idempotency-Key": idempotency_key}
+                )
+            
+            if response.status_code == 200:
+                return _loads(response.content).get("receipt")
+            logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+            return None
+        
+        except Exception as e:
+            logger.warning("Signet request failed: %s", e)
+            return None
+    
+    def _submit_exchange(self, payload: Dict[str, Any]) -> None:
+        """Start verifying an exchange in the background and return at once; see `_collect`."""
+        if self._async_client is not None:
+            key = self._next_idempotency_key()
+            future = self._async_client.submit(self._send_to_signet_async(payload, key))
+        else:
+            future = self._pool.submit(self._send_to_signet, payload)
+        with self._lock:
+            self._inflight.append(future)
+    
+    def _collect(self, timeout: float = 30) -> int:
+        """Wait for background exchanges and record their receipts."""
+        with self._lock:
+            inflight, self._inflight = self._inflight, deque()
+        if not inflight:
+            return 0
+        
+        done, not_done = wait(inflight, timeout=timeout)
+        receipts = [receipt for receipt in (future.result() for future in done) if receipt]
+        with self._lock:
+            self.verified_exchanges.extend(map(ReceiptRef.from_receipt, receipts))
+        if not_done:
+            logger.warning("%d exchanges still pending after %ss", len(not_done), timeout)
+        logger.debug("Verified %d/%d background exchanges", len(receipts), len(inflight))
+        return len(receipts)
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created on first use if background sends did not need it."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="signet")
+            return self._pool
+    
+    def close(self) -> None:
+        """Collect background exchanges and stop the background client or pool."""
+        self._collect()
+        if self._async_client is not None:
+            self._async_client.close()
+            self._async_client = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
     def _should_route_through_signet(self, action: AgentAction) -> bool:
         """Determine if an agent action should be routed through Signet."""
         # Route financial/invoice tools through Signet
-        financial_tools = ['create_invoice', 'process_payment', 'generate_receipt']
-        return action.tool in financial_tools
+        return action.tool in _SIGNET_TOOLS
     
     def _contains_structured_data(self, text: str) -> bool:
         """Check if text contains structured data."""
         return '{' in text and '}' in text
     
-    def _export_chain(self) -> None:
-        """Export the complete receipt chain."""
-        if not self.current_trace_id:
-            return
+    def _export_chain(self) -> Optional[Future]:
+        """Export the complete receipt chain on a worker thread; see `wait_for_export`.
         
+        Skipped below `export_threshold` verified exchanges.
+        """
+        if not self.current_trace_id or len(self.verified_exchanges) < self.export_threshold:
+            return None
+        
+        self._export_future = self._executor().submit(
+            self._do_export, self.current_trace_id, len(self.verified_exchanges)
+        )
+        return self._export_future
+    
+    def _do_export(self, trace_id: str, count: int) -> bool:
+        """Request the chain export; only the status is needed, so the body is not read."""
         try:
             response = self.session.get(
-                f"{self.signet_url}/v1/receipts/export/{self.current_trace_id}",
-                timeout=10
+                f"{self.signet_url}/v1/receipts/export/{trace_id}",
+                timeout=10,
+                stream=True
             )
+            response.close()
             
             if response.status_code == 200:
-                print(f"📤 Signet: Chain exported - {len(self.verified_exchanges)} receipts")
+                logger.info("Chain exported - %d receipts", count)
                 # Optionally save to file or send to webhook
+                return True
             
         except Exception as e:
-            print(f"⚠️ Signet: Chain export failed: {str(e)}")
+            logger.warning("Chain export failed: %s", e)
+        return False
+    
+    def wait_for_export(self, timeout: Optional[float] = None) -> bool:
+        """Block until the last chain export finishes; True if it succeeded."""
+        if self._export_future is None:
+            return False
+        return self._export_future.result(timeout)
 
 
 class SignetRunnable:
@@ -302,10 +725,12 @@ class SignetRunnable:
 def enable_signet_verification(
     signet_url: str,
     api_key: str,
-    forward_url: Optional[str] = None
+    forward_url: Optional[str] = None,
+    **kwargs: Any
 ) -> SignetCallbackHandler:
     """
     One-liner to enable Signet verification for LangChain.
+    Extra keyword arguments (e.g. background=True, max_concurrent=8) go to the handler.
     
     Usage:
         signet = enable_signet_verification(
@@ -319,7 +744,8 @@ def enable_signet_verification(
     return SignetCallbackHandler(
         signet_url=signet_url,
         api_key=api_key,
-        forward_url=forward_url
+        forward_url=forward_url,
+        **kwargs
     )
 
 
@@ -330,6 +756,8 @@ if __name__ == "__main__":
     from langchain.chains import LLMChain
     from langchain.prompts import PromptTemplate
     
+    logging.basicConfig(level=logging.INFO)
+    
     # Create a simple chain
     llm = OpenAI(temperature=0)
     prompt = PromptTemplate(
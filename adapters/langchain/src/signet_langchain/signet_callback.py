@@ -14,19 +14,29 @@ from pathlib import Path
 import importlib.util
 import sys
 
-_ORIG_PATH = Path(__file__).resolve().parents[3] / "adapters" / "langchain" / "signet_callback.py"
+_IMPL_NAME = "_signet_callback_impl"
 
-if _ORIG_PATH.exists():
-    spec = importlib.util.spec_from_file_location("_signet_callback_impl", _ORIG_PATH)
-    _mod = importlib.util.module_from_spec(spec)  # type: ignore
+# Reuse the implementation if another import path already loaded it
+_mod = sys.modules.get(_IMPL_NAME)
+if _mod is None:
+    _ORIG_PATH = Path(__file__).resolve().parents[3] / "adapters" / "langchain" / "signet_callback.py"
+    if not _ORIG_PATH.exists():
+        raise FileNotFoundError(f"Original Signet callback implementation not found at {_ORIG_PATH}")
+    spec = importlib.util.spec_from_file_location(_IMPL_NAME, _ORIG_PATH)
     assert spec and spec.loader
-    spec.loader.exec_module(_mod)  # type: ignore
-    # Re-export selected public symbols
-    SignetCallbackHandler = getattr(_mod, "SignetCallbackHandler")
-    SignetRunnable = getattr(_mod, "SignetRunnable")
-    enable_signet_verification = getattr(_mod, "enable_signet_verification")
-else:
-    raise FileNotFoundError(f"Original Signet callback implementation not found at {_ORIG_PATH}")
+    _mod = importlib.util.module_from_spec(spec)  # type: ignore
+    # Register before executing, as the import system does, so re-entrant imports share it
+    sys.modules[_IMPL_NAME] = _mod
+    try:
+        spec.loader.exec_module(_mod)  # type: ignore
+    except BaseException:
+        del sys.modules[_IMPL_NAME]
+        raise
+
+# Re-export selected public symbols
+SignetCallbackHandler = getattr(_mod, "SignetCallbackHandler")
+SignetRunnable = getattr(_mod, "SignetRunnable")
+enable_signet_verification = getattr(_mod, "enable_signet_verification")
 
 __all__ = [
     "SignetCallbackHandler",
@@ -3,13 +3,153 @@ Signet Protocol - LlamaIndex Integration
 Callback handler for verified AI-to-AI communications in LlamaIndex.
 """
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
+import logging
+import re
+import threading
+import time
 import uuid
 import requests
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
 from llama_index.core.callbacks.base import BaseCallbackHandler
 from llama_index.core.callbacks.schema import CBEventType, EventPayload
 
+try:
+    import httpx
+except ImportError:  # httpx is optional; without it batches go out on the requests session
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# HTTP/2 multiplexing needs the optional `h2` package alongside httpx
+_HTTP2 = httpx is not None and importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger("signet.llamaindex")
+
+# Routing tables built once at import; frozenset membership and isdisjoint run in C
+_SIGNET_FUNCS = frozenset({
+    'create_invoice', 'process_payment', 'generate_receipt',
+    'update_invoice', 'create_order', 'process_transaction',
+    'calculate_total', 'apply_discount', 'validate_payment'
+})
+_FIN_FIELDS = frozenset({'amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price'})
+# One case-insensitive pass over the name instead of lower() plus a scan per term
+_FIN_FUNC_RE = re.compile(r'invoice|payment|order|transaction|receipt', re.IGNORECASE)
+# Negative prefilter on raw JSON text: no quoted financial key anywhere means the
+# decoded object cannot carry one at top level either, so decoding can be skipped.
+# Derived from _FIN_FIELDS so the two can never drift apart.
+_FIN_KEY_RE = re.compile('"(?:' + '|'.join(map(re.escape, sorted(_FIN_FIELDS))) + ')"')
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body once, straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text or a response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _build_tooluse_payload(name: str, arguments_json: str) -> Dict[str, Any]:
+    """The `payload` body of an exchange: one function tool call."""
+    return {"tool_calls": [{"type": "function", "function": {"name": name, "arguments": arguments_json}}]}
+
+
+def _content_digest(payload: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON form of a payload (sorted keys, no whitespace)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _RecentReceipts:
+    """Receipts of recently verified payloads, keyed by content digest.
+    
+    Bounded LRU with a TTL: a retried or replayed callback carrying the same
+    payload gets the earlier receipt back without another round trip.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(digest)
+            if entry is None:
+                return None
+            receipt, stored_at = entry
+            if time.monotonic() - stored_at >= self._ttl:
+                del self._items[digest]
+                return None
+            self._items.move_to_end(digest)
+            return receipt
+    
+    def put(self, digest: str, receipt: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[digest] = (receipt, time.monotonic())
+            self._items.move_to_end(digest)
+            if len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+
+class _SignetAsyncClient:
+    """Pooled httpx client driven by a private event loop on a daemon thread.
+    
+    LlamaIndex fires callbacks synchronously, so sends are handed to this loop
+    and come back as `concurrent.futures.Future`s instead of blocking the caller.
+    """
+    
+    def __init__(self, headers: Dict[str, str], limit: int = 64, keepalive: int = 32):
+        self._headers = headers
+        self._limits = (limit, keepalive)
+        self._http = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="signet-async", daemon=True)
+        self._thread.start()
+    
+    @property
+    def http(self):
+        """The shared AsyncClient (created on the loop thread on first use)."""
+        if self._http is None:
+            limit, keepalive = self._limits
+            self._http = httpx.AsyncClient(
+                headers=self._headers,
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=keepalive),
+                timeout=30
+            )
+        return self._http
+    
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the client's loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def close(self) -> None:
+        """Close the HTTP client and stop the loop thread."""
+        if self._http is not None:
+            self.submit(self._http.aclose()).result(10)
+            self._http = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop.close()
+
+
 class SignetLlamaIndexHandler(BaseCallbackHandler):
     """
     LlamaIndex callback handler that routes tool calls through Signet Protocol.
@@ -35,6 +175,9 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
         forward_url: Optional[str] = None,
         tenant: Optional[str] = None,
         auto_forward: bool = True,
+        flush_size: int = 16,
+        flush_interval: float = 0.5,
+        max_receipts: int = 10_000,
         **kwargs
     ):
         super().__init__(
@@ -46,11 +189,42 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
         self.forward_url = forward_url
         self.tenant = tenant or "llamaindex"
         self.auto_forward = auto_forward
-        self.session = requests.Session()
         
-        # Track current trace for chaining
+        # Static headers live on the session; each request adds only its idempotency key.
+        # The session (and its connection pool) is created on the first request.
+        self._base_headers = {"X-SIGNET-API-Key": api_key, "Content-Type": "application/json"}
+        self._session: Optional[requests.Session] = None
+        
+        # Static part of every exchange payload, built once
+        self._payload_template = {
+            "payload_type": "openai.tooluse.invoice.v1",
+            "target_type": "invoice.iso20022.v1",
+            "forward_url": self.forward_url if self.auto_forward else None
+        }
+        
+        # Track current trace for chaining; only the newest max_receipts are kept
         self.current_trace_id = None
-        self.verified_exchanges = []
+        self.verified_exchanges = deque(maxlen=max_receipts)
+        
+        # Exchanges waiting to go out in the next /v1/exchange:batch request
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # With httpx installed, batches are sent on a background loop (started with
+        # the first batch) so the callback returns at once; flush() waits for whatever
+        # is still in flight
+        self._client: Optional[_SignetAsyncClient] = None
+        self._inflight: set = set()
+        
+        # Worker threads for blocking requests calls made from inside an event loop
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._bg_futures: set = set()
+        
+        # Receipts of recent single sends, so identical payloads are not re-verified
+        self._recent = _RecentReceipts()
     
     def on_event_start(
         self,
@@ -66,8 +240,9 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
             if not self.current_trace_id:
                 self.current_trace_id = f"llamaindex-{uuid.uuid4()}"
             
-            function_name = payload.get("function_call", {}).get("name", "unknown_function")
-            print(f"🔗 Signet: Function '{function_name}' starting (trace: {self.current_trace_id})")
+            if logger.isEnabledFor(logging.DEBUG):
+                function_name = payload.get("function_call", {}).get("name", "unknown_function")
+                logger.debug("Function %r starting (trace: %s)", function_name, self.current_trace_id)
         
         return event_id
     
@@ -90,20 +265,18 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
                     parsed_output = self._parse_function_output(function_output, function_call)
                     
                     if parsed_output:
-                        receipt = self._send_to_signet(parsed_output)
-                        if receipt:
-                            self.verified_exchanges.append(receipt)
-                            print(f"✅ Signet: Verified exchange recorded (hop: {receipt.get('hop')})")
-                        else:
-                            print("❌ Signet: Exchange verification failed")
+                        self._enqueue(parsed_output)
             
             except Exception as e:
-                print(f"⚠️ Signet: Error processing function output: {str(e)}")
+                logger.warning("Error processing function output: %s", e)
         
         elif event_type == CBEventType.QUERY:
             # Query completed - export chain if we have multiple exchanges
-            if len(self.verified_exchanges) > 1:
-                self._export_chain()
+            if self._in_event_loop():
+                # Flushing and exporting block on requests; keep them off the caller's loop
+                self._track(self._executor().submit(self._finish_query), self._bg_futures)
+            else:
+                self._finish_query()
     
     def start_trace(self, trace_id: Optional[str] = None) -> None:
         """Start a new trace."""
@@ -115,21 +288,14 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
         trace_map: Optional[Dict[str, List[str]]] = None,
     ) -> None:
         """End the current trace."""
+        self.flush()
         if self.verified_exchanges:
-            print(f"🏁 Signet: Session complete - {len(self.verified_exchanges)} verified exchanges")
+            logger.info("Session complete - %d verified exchanges", len(self.verified_exchanges))
     
     def _should_route_through_signet(self, function_call: Dict[str, Any]) -> bool:
         """Determine if a function call should be routed through Signet."""
-        function_name = function_call.get("name", "")
-        
         # Route financial/invoice/data processing functions through Signet
-        signet_functions = [
-            'create_invoice', 'process_payment', 'generate_receipt',
-            'update_invoice', 'create_order', 'process_transaction',
-            'calculate_total', 'apply_discount', 'validate_payment'
-        ]
-        
-        return function_name in signet_functions
+        return function_call.get("name", "") in _SIGNET_FUNCS
     
     def _parse_function_output(
         self, 
@@ -143,7 +309,10 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
             
             # Try to parse output as JSON first
             if isinstance(output, str) and output.strip().startswith('{'):
-                data = json.loads(output)
+                # Unless the function name already qualifies, only parse text that mentions a financial key
+                if _FIN_KEY_RE.search(output) is None and not self._function_looks_financial(function_name):
+                    return None
+                data = _loads(output)
             elif isinstance(output, dict):
                 data = output
             else:
@@ -165,60 +334,293 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
     
     def _is_financial_data(self, data: Dict[str, Any], function_name: str) -> bool:
         """Check if data structure looks like financial/invoice data."""
-        financial_fields = ['amount', 'currency', 'invoice_id', 'payment_id', 'customer', 'total', 'price']
-        financial_functions = ['invoice', 'payment', 'order', 'transaction', 'receipt']
-        
         # Check if data contains financial fields
-        has_financial_fields = any(field in data for field in financial_fields)
+        has_financial_fields = not _FIN_FIELDS.isdisjoint(data)
         
         # Check if function name suggests financial operation
-        has_financial_function = any(term in function_name.lower() for term in financial_functions)
-        
-        return has_financial_fields or has_financial_function
+        return has_financial_fields or self._function_looks_financial(function_name)
+    
+    @staticmethod
+    def _function_looks_financial(function_name: str) -> bool:
+        """Whether the function name suggests a financial operation."""
+        return _FIN_FUNC_RE.search(function_name) is not None
     
     def _convert_to_signet_payload(self, data: Dict[str, Any], function_name: str) -> Dict[str, Any]:
         """Convert parsed data to Signet Protocol payload format."""
-        return {
-            "payload_type": "openai.tooluse.invoice.v1",
-            "target_type": "invoice.iso20022.v1",
-            "trace_id": self.current_trace_id,
-            "payload": {
-                "tool_calls": [{
-                    "type": "function",
-                    "function": {
-                        "name": function_name,
-                        "arguments": json.dumps(data)
-                    }
-                }]
-            },
-            "forward_url": self.forward_url if self.auto_forward else None
-        }
+        payload = self._payload_template.copy()
+        payload["trace_id"] = self.current_trace_id
+        payload["payload"] = _build_tooluse_payload(function_name, _dumps(data).decode("utf-8"))
+        return payload
+    
+    def _enqueue(self, payload: Dict[str, Any]) -> None:
+        """Buffer an exchange; flush at `flush_size` items or after `flush_interval` seconds.
+        
+        Items are keyed by content digest, as single sends are, so a repeated
+        payload replays its receipt; within the TTL it is answered locally.
+        """
+        digest = _content_digest(payload)
+        cached = self._recent.get(digest)
+        if cached is not None:
+            self._record([cached])
+            return
+        with self._pending_lock:
+            self._pending.append((digest, payload))
+            full = len(self._pending) >= self._flush_size
+            if not full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_interval, self._dispatch)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if full:
+            self._dispatch()
+    
+    def _dispatch(self) -> None:
+        """Send the buffered exchanges; in the background when the async client is available."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not batch:
+                return
+            # Registered while the batch is detached, so a flush() racing with this
+            # dispatch (e.g. from the timer thread) waits for its receipts
+            dispatching = Future()
+            self._inflight.add(dispatching)
+        
+        try:
+            if httpx is not None:
+                self._track(self._async_client().submit(self._verify_batch_async(batch)), self._inflight)
+            elif self._in_event_loop():
+                # requests blocks for the whole round trip; don't stall the caller's loop
+                self._track(self._executor().submit(self._verify_batch, batch), self._inflight)
+            else:
+                self._verify_batch(batch)
+        finally:
+            with self._pending_lock:
+                self._inflight.discard(dispatching)
+            dispatching.set_result(None)
+    
+    def _verify_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        self._record(self._send_batch(batch), batch)
+    
+    async def _verify_batch_async(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        # Record before the future resolves so flush() never returns ahead of the receipts
+        self._record(await self._send_batch_async(batch), batch)
+    
+    def _finish_query(self) -> None:
+        self.flush()
+        if len(self.verified_exchanges) > 1:
+            self._export_chain()
+    
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Whether the calling thread is running an asyncio event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    @property
+    def session(self) -> requests.Session:
+        """The requests session, created on first use."""
+        if self._session is None:
+            session = requests.Session()
+            session.headers.update(self._base_headers)
+            self._session = session
+        return self._session
+    
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._session = session
+    
+    def _async_client(self) -> _SignetAsyncClient:
+        """The background httpx client, started on first use."""
+        with self._pending_lock:
+            if self._client is None:
+                self._client = _SignetAsyncClient(self._base_headers)
+            return self._client
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """The worker pool, created on first use."""
+        with self._pending_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="signet")
+            return self._pool
+    
+    def _track(self, future: Future, registry: set) -> None:
+        """Hold a strong reference to a background future until it finishes."""
+        with self._pending_lock:
+            registry.add(future)
+        future.add_done_callback(functools.partial(self._on_background_done, registry))
+    
+    def _on_background_done(self, registry: set, future: Future) -> None:
+        with self._pending_lock:
+            registry.discard(future)
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            logger.warning("Background send failed: %s", error)
+    
+    def _record(
+        self,
+        receipts: List[Optional[Dict[str, Any]]],
+        batch: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+    ) -> None:
+        """Keep verified receipts; with the sent batch, also remember them by content digest."""
+        digests = [digest for digest, _ in batch] if batch is not None else [None] * len(receipts)
+        for digest, receipt in zip(digests, receipts, strict=True):
+            if receipt:
+                self.verified_exchanges.append(receipt)
+                if digest is not None:
+                    self._recent.put(digest, receipt)
+                logger.debug("Verified exchange recorded (hop: %s)", receipt.get('hop'))
+            else:
+                logger.warning("Exchange verification failed")
+    
+    def flush(self, timeout: float = 30) -> None:
+        """Send all buffered exchanges and wait until their receipts are recorded."""
+        self._dispatch()
+        deadline = time.monotonic() + timeout
+        while True:
+            # Re-check: a dispatch finishing may have handed its batch to a tracked future
+            with self._pending_lock:
+                inflight = [f for f in self._inflight if not f.done()]
+            remaining = deadline - time.monotonic()
+            if not inflight or remaining <= 0:
+                return
+            wait(inflight, timeout=remaining)
+    
+    def close(self) -> None:
+        """Flush buffered exchanges and shut down the background client and workers."""
+        self.flush()
+        with self._pending_lock:
+            background = list(self._bg_futures)
+        if background:
+            wait(background, timeout=30)
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    def _send_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """POST buffered (digest, payload) exchanges in one request; one receipt (or None) per item."""
+        try:
+            response = self.session.post(
+                f"{self.signet_url}/v1/exchange:batch",
+                data=self._batch_body(batch),
+                timeout=30
+            )
+            
+            if response.status_code == 404:
+                # Server predates the batch route: send one by one
+                return [self._send_to_signet(payload) for _, payload in batch]
+            if response.status_code != 200:
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+                return [None] * len(batch)
+            
+            return self._batch_receipts(_loads(response.content), len(batch))
+        
+        except Exception as e:
+            logger.warning("Signet batch request failed: %s", e)
+            return [None] * len(batch)
+    
+    async def _send_batch_async(self, batch: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """`_send_batch` on the pooled AsyncClient; the 404 fallback sends concurrently."""
+        try:
+            response = await self._client.http.post(
+                f"{self.signet_url}/v1/exchange:batch",
+                content=self._batch_body(batch)
+            )
+            
+            if response.status_code == 404:
+                return list(await asyncio.gather(*(self._send_to_signet_async(payload) for _, payload in batch)))
+            if response.status_code != 200:
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+                return [None] * len(batch)
+            
+            return self._batch_receipts(_loads(response.content), len(batch))
+        
+        except Exception as e:
+            logger.warning("Signet batch request failed: %s", e)
+            return [None] * len(batch)
+    
+    @staticmethod
+    def _batch_body(batch: List[Tuple[str, Dict[str, Any]]]) -> bytes:
+        """Encode a batch; each item carries its content-digest idempotency key."""
+        return _dumps({
+            "exchanges": [{**payload, "idempotency_key": f"sha256:{digest}"} for digest, payload in batch]
+        })
+    
+    @staticmethod
+    def _batch_receipts(body: Dict[str, Any], count: int) -> List[Optional[Dict[str, Any]]]:
+        """Receipts from a batch response, in request order (None for failed items)."""
+        results = body.get("results", [])[:count]
+        return [
+            (item.get("response") or {}).get("receipt") if item.get("status_code") == 200 else None
+            for item in results
+        ] + [None] * (count - len(results))
     
     def _send_to_signet(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Send payload to Signet Protocol for verification."""
+        """Send payload to Signet Protocol for verification.
+        
+        The idempotency key is the payload's content digest, so a repeated
+        payload replays its receipt; within the TTL it is answered locally.
+        """
         try:
-            headers = {
-                "X-SIGNET-API-Key": self.api_key,
-                "X-SIGNET-Idempotency-Key": f"{self.current_trace_id}-{uuid.uuid4()}",
-                "Content-Type": "application/json"
-            }
+            digest = _content_digest(payload)
+            cached = self._recent.get(digest)
+            if cached is not None:
+                return cached
+            
+            headers = {"X-SIGNET-Idempotency-Key": f"sha256:{digest}"}
             
             response = self.session.post(
                 f"{self.signet_url}/v1/exchange",
-                json=payload,
+                data=_dumps(payload),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
-                return result.get("receipt")
+                result = _loads(response.content)
+                receipt = result.get("receipt")
+                if receipt:
+                    self._recent.put(digest, receipt)
+                return receipt
             else:
-                print(f"❌ Signet API error: {response.status_code} - {response.text}")
+                logger.warning("Signet API error: %s - %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ Signet request failed: {str(e)}")
+            logger.warning("Signet request failed: %s", e)
+            return None
+    
+    async def _send_to_signet_async(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Awaitable `_send_to_signet`, run on the background client's loop."""
+        try:
+            digest = _content_digest(payload)
+            cached = self._recent.get(digest)
+            if cached is not None:
+                return cached
+            
+            response = await self._client.http.post(
+                f"{self.signet_url}/v1/exchange",
+                content=_dumps(payload),
+                headers={"X-SIGNET-Idempotency-Key": f"sha256:{digest}"}
+            )
+            
+            if response.status_code == 200:
+                receipt = _loads(response.content).get("receipt")
+                if receipt:
+                    self._recent.put(digest, receipt)
+                return receipt
+            logger.warning("Signet API error: %s - %s", response.status_code, response.text)
+            return None
+        
+        except Exception as e:
+            logger.warning("Signet request failed: %s", e)
             return None
     
     def _export_chain(self) -> None:
@@ -233,11 +635,11 @@ class SignetLlamaIndexHandler(BaseCallbackHandler):
             )
             
             if response.status_code == 200:
-                print(f"📤 Signet: Chain exported - {len(self.verified_exchanges)} receipts")
+                logger.info("Chain exported - %d receipts", len(self.verified_exchanges))
                 # Optionally save to file or send to webhook
             
         except Exception as e:
-            print(f"⚠️ Signet: Chain export failed: {str(e)}")
+            logger.warning("Chain export failed: %s", e)
 
 
 # Convenience function for quick setup
@@ -274,6 +676,8 @@ if __name__ == "__main__":
     from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, Settings
     from llama_index.llms.openai import OpenAI
     
+    logging.basicConfig(level=logging.INFO)
+    
     # Enable Signet verification
     signet_handler = enable_signet_for_llamaindex(
         signet_url="http://localhost:8088",
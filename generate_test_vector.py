@@ -1,8 +1,7 @@
 import sys
 sys.path.append('server')
-from utils.jcs import canonicalize
+from utils.jcs import canonicalize_bytes, sha256_cid
 import json
-import hashlib
 
 # Create a proper receipt
 receipt = {
@@ -22,10 +21,7 @@ receipt = {
 }
 
 # Calculate the correct receipt hash
-receipt_copy = receipt.copy()
-receipt_copy.pop("receipt_hash", None)
-canonical = canonicalize(receipt_copy)
-receipt_hash = "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+receipt_hash = sha256_cid(canonicalize_bytes(receipt, exclude=frozenset(("receipt_hash",))))
 receipt["receipt_hash"] = receipt_hash
 
 print("Correct receipt:")
@@ -13,6 +13,7 @@ def get_provider_info():
         "versions": [__version__],
         "operators": [
             "signet_provider.operators.SignetExchangeOperator",
+            "signet_provider.operators.SignetBatchExchangeOperator",
         ],
         "hooks": [
             "signet_provider.hooks.SignetHook",
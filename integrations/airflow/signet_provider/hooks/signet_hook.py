@@ -4,11 +4,53 @@ Connection management for Signet Protocol API.
 """
 
 import json
+import threading
 import uuid
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from airflow.hooks.base import BaseHook
 from airflow.models import Connection
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Operators build a new hook per task run; share one pooled session per
+# connection (host + key) so each worker process reuses its TCP/TLS connections.
+_SESSION_CACHE: Dict[Tuple[str, str, Optional[str]], requests.Session] = {}
+_SESSION_LOCK = threading.Lock()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body; orjson when available, stdlib for what it rejects."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Integers beyond 64 bits or non-str keys
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _pooled_session(api_key: Optional[str]) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "X-SIGNET-API-Key": api_key,
+        "User-Agent": "signet-airflow-provider/1.0.0",
+        "Connection": "keep-alive",
+    })
+    return session
 
 
 class SignetHook(BaseHook):
@@ -23,7 +65,10 @@ class SignetHook(BaseHook):
     default_conn_name = "signet_default"
     conn_type = "signet"
     hook_name = "Signet Protocol"
-    
+
+    # Server-side limit on exchanges per /v1/exchange:batch request
+    MAX_BATCH_SIZE = 100
+
     def __init__(
         self,
         signet_conn_id: str = default_conn_name,
@@ -69,12 +114,12 @@ class SignetHook(BaseHook):
             self._base_url = connection.host.rstrip('/')
             self._api_key = connection.password
             
-            self._session = requests.Session()
-            self._session.headers.update({
-                "Content-Type": "application/json",
-                "X-SIGNET-API-Key": self._api_key,
-                "User-Agent": "signet-airflow-provider/1.0.0"
-            })
+            key = (self.signet_conn_id, self._base_url, self._api_key)
+            with _SESSION_LOCK:
+                session = _SESSION_CACHE.get(key)
+                if session is None:
+                    session = _SESSION_CACHE[key] = _pooled_session(self._api_key)
+            self._session = session
         
         return self._session
     
@@ -140,7 +185,7 @@ class SignetHook(BaseHook):
         
         response = session.post(
             f"{self._base_url}/v1/exchange",
-            json=exchange_data,
+            data=_dumps(exchange_data),
             headers=headers,
             timeout=self.timeout
         )
@@ -149,7 +194,60 @@ class SignetHook(BaseHook):
             return response.json()
         else:
             response.raise_for_status()
-    
+
+    def create_exchange_batch(
+        self,
+        items: List[Dict[str, Any]],
+        payload_type: str = "openai.tooluse.invoice.v1",
+        target_type: str = "invoice.iso20022.v1",
+        forward_url: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several verified exchanges with one request per ``MAX_BATCH_SIZE`` items.
+
+        Each item is an exchange body (``payload`` plus optional ``payload_type``,
+        ``target_type``, ``forward_url``, ``trace_id`` and ``idempotency_key``);
+        missing fields fall back to the arguments or generated IDs as in
+        :meth:`create_exchange`.
+
+        :param items: Exchange bodies to submit
+        :param payload_type: Default source payload type
+        :param target_type: Default target payload type
+        :param forward_url: Default URL to forward normalized data
+        :return: Per-item results in input order, each with ``status_code`` and
+            either ``response`` or ``detail``
+        """
+        session = self.get_conn()
+
+        exchanges = []
+        for item in items:
+            trace_id = item.get("trace_id") or f"airflow-{uuid.uuid4()}"
+            exchange_data = {
+                "payload_type": item.get("payload_type", payload_type),
+                "target_type": item.get("target_type", target_type),
+                "payload": item["payload"],
+                "trace_id": trace_id,
+                "idempotency_key": item.get("idempotency_key") or f"{trace_id}-{uuid.uuid4()}",
+            }
+            if item.get("forward_url", forward_url):
+                exchange_data["forward_url"] = item.get("forward_url", forward_url)
+            exchanges.append(exchange_data)
+
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(exchanges), self.MAX_BATCH_SIZE):
+            response = session.post(
+                f"{self._base_url}/v1/exchange:batch",
+                data=_dumps({"exchanges": exchanges[start:start + self.MAX_BATCH_SIZE]}),
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                results.extend(response.json()["results"])
+            else:
+                response.raise_for_status()
+
+        return results
+
     def get_receipt_chain(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
         """
         Get the complete receipt chain for a trace ID.
@@ -157,17 +255,23 @@ class SignetHook(BaseHook):
         :param trace_id: Trace ID to retrieve
         :return: List of receipts in the chain
         """
+        _, chain, _ = self._fetch_chain(trace_id)
+        return chain
+    
+    def _fetch_chain(self, trace_id: str, etag: Optional[str] = None):
+        """Conditional chain fetch; returns (status_code, chain or None, etag)."""
         session = self.get_conn()
         
         response = session.get(
             f"{self._base_url}/v1/receipts/chain/{trace_id}",
+            headers={"If-None-Match": etag} if etag else None,
             timeout=self.timeout
         )
         
         if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            return None
+            return 200, response.json(), response.headers.get("ETag")
+        elif response.status_code in (304, 404):
+            return response.status_code, None, etag
         else:
             response.raise_for_status()
     
@@ -209,25 +313,32 @@ class SignetHook(BaseHook):
         """
         Wait for receipt chain to reach minimum number of hops.
         
+        Polls with exponential backoff from 0.25s up to ``poll_interval`` and sends
+        the last chain ETag, so an unchanged chain costs a bodiless 304.
+        
         :param trace_id: Trace ID to monitor
         :param min_hops: Minimum number of hops to wait for
         :param max_wait_seconds: Maximum time to wait
-        :param poll_interval: Polling interval in seconds
+        :param poll_interval: Longest delay between polls in seconds
         :return: Receipt chain when condition is met
         """
         import time
         
-        start_time = time.time()
+        deadline = time.monotonic() + max_wait_seconds
+        delay = 0.25
+        etag = None
         
-        while time.time() - start_time < max_wait_seconds:
-            chain = self.get_receipt_chain(trace_id)
+        while True:
+            _, chain, etag = self._fetch_chain(trace_id, etag)
             
             if chain and len(chain) >= min_hops:
                 return chain
             
-            time.sleep(poll_interval)
-        
-        return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, poll_interval, remaining))
+            delay *= 2
     
     def get_billing_dashboard(self) -> Dict[str, Any]:
         """Get billing dashboard data."""
@@ -5,7 +5,7 @@ Airflow operator for creating verified exchanges.
 
 import json
 import uuid
-from typing import Any, Dict, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from airflow.models import BaseOperator
 from airflow.utils.context import Context
 from airflow.utils.decorators import apply_defaults
@@ -135,6 +135,102 @@ class SignetExchangeOperator(BaseOperator):
         return result
 
 
+class SignetBatchExchangeOperator(BaseOperator):
+    """
+    Operator for creating many verified exchanges in a single task.
+
+    Replaces a fan-out of ``SignetExchangeOperator`` tasks with one call to
+    ``/v1/exchange:batch`` per 100 payloads. Per-item results are stored in XCom
+    in payload order.
+
+    :param payloads: List of data payloads to exchange (can be templated)
+    :param payload_type: Source payload type (default: openai.tooluse.invoice.v1)
+    :param target_type: Target payload type (default: invoice.iso20022.v1)
+    :param forward_url: Optional URL to forward normalized data (can be templated)
+    :param signet_conn_id: Airflow connection ID for Signet Protocol
+    :param fail_on_error: Whether to fail the task if any exchange is rejected
+    """
+
+    template_fields: Sequence[str] = (
+        "payloads",
+        "forward_url",
+    )
+    template_fields_renderers = {
+        "payloads": "json",
+    }
+
+    ui_color = "#4A90E2"
+    ui_fgcolor = "#FFFFFF"
+
+    @apply_defaults
+    def __init__(
+        self,
+        payloads: Union[List[Dict[str, Any]], str],
+        payload_type: str = "openai.tooluse.invoice.v1",
+        target_type: str = "invoice.iso20022.v1",
+        forward_url: Optional[str] = None,
+        signet_conn_id: str = "signet_default",
+        fail_on_error: bool = True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.payloads = payloads
+        self.payload_type = payload_type
+        self.target_type = target_type
+        self.forward_url = forward_url
+        self.signet_conn_id = signet_conn_id
+        self.fail_on_error = fail_on_error
+
+    def execute(self, context: Context) -> List[Dict[str, Any]]:
+        """Execute the batched Signet exchanges."""
+        hook = SignetHook(signet_conn_id=self.signet_conn_id)
+
+        # Parse payloads if they're a string
+        if isinstance(self.payloads, str):
+            try:
+                payloads = json.loads(self.payloads)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid JSON payloads: {self.payloads}")
+        else:
+            payloads = self.payloads
+
+        # One trace per payload, as a fan-out of single-exchange tasks would have
+        trace_prefix = f"airflow-{context['dag_run'].run_id}-{self.task_id}"
+        items = [
+            {"payload": payload, "trace_id": f"{trace_prefix}-{i}"}
+            for i, payload in enumerate(payloads)
+        ]
+
+        self.log.info(f"Creating {len(items)} Signet exchanges in batch")
+        self.log.info(f"Payload type: {self.payload_type} -> {self.target_type}")
+
+        results = hook.create_exchange_batch(
+            items,
+            payload_type=self.payload_type,
+            target_type=self.target_type,
+            forward_url=self.forward_url,
+        )
+
+        failed = [r for r in results if r.get("status_code") != 200]
+        self.log.info(f"Batch complete: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+        for r in failed:
+            self.log.warning(f"Exchange {r.get('idempotency_key')} failed: {r.get('status_code')} {r.get('detail')}")
+
+        context['task_instance'].xcom_push(
+            key='signet_batch_results',
+            value=results
+        )
+        context['task_instance'].xcom_push(
+            key='signet_trace_ids',
+            value=[item["trace_id"] for item in items]
+        )
+
+        if failed and self.fail_on_error:
+            raise ValueError(f"{len(failed)} of {len(results)} Signet exchanges failed")
+
+        return results
+
+
 class SignetChainOperator(BaseOperator):
     """
     Operator for retrieving and exporting Signet receipt chains.
@@ -13,12 +13,13 @@
 # limitations under the License.
 
 import os, json, time, uuid, pathlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from .settings import load_settings, create_storage_from_settings
+from .settings import get_settings, create_storage_from_settings
 from .pipeline.sanitize import sanitize_payload
 from .pipeline.repair import repair_json_string
 from .pipeline.fallback import NullProvider
@@ -27,7 +28,8 @@ from .pipeline.transform import transform
 from .pipeline.policy import hel_allow_forward
 from .pipeline.forward import safe_forward
 from .pipeline.storage import StorageConflict
-from .pipeline.receipts import make_receipt
+from .pipeline.batching import UsageWriter
+from .pipeline.receipts import make_receipt, verify_chain_hashes
 from .pipeline.metrics import (
     exchanges_total,
     denied_total,
@@ -44,6 +46,7 @@ from .pipeline.metrics import (
     phase_latency_hist,
 )
 from .utils.tracing import init_tracer, phase
+from .utils.clock import utcnow_iso
 from .utils.jcs import cid_for_json, canonicalize
 from .utils.crypto import load_signing_key, make_jwk_from_signing_key, sign_export_bundle
 from fastjsonschema import compile as compile_schema
@@ -57,9 +60,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-SET = load_settings()
+SET = get_settings()
 init_tracer()
 STORE = create_storage_from_settings(SET)
+# Usage rows are written in batches off the request path; flushed on shutdown
+USAGE = UsageWriter(STORE)
+
+@app.on_event("shutdown")
+def flush_usage():
+    USAGE.flush()
 
 # Signing
 SK = load_signing_key(SET.private_key_b64) if SET.private_key_b64 else None
@@ -86,8 +95,17 @@ with open(base / "schemas" / "maps" / "openai.tooluse.invoice.v1__invoice.iso200
 validate_from = compile_schema(SCHEMA_FROM)
 validate_to = compile_schema(SCHEMA_TO)
 
+def resolve_tenant(api_key: Optional[str]):
+    """Validate an API key and return its tenant config in a single lookup"""
+    if not api_key:
+        raise HTTPException(status_code=401, detail="missing api key header")
+    tenant_cfg = SET.api_keys.get(api_key)
+    if not tenant_cfg:
+        raise HTTPException(status_code=401, detail="invalid api key")
+    return tenant_cfg
+
 def utcnow():
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return utcnow_iso()
 
 @app.get("/healthz")
 def healthz():
@@ -112,12 +130,15 @@ async def alert_webhook(request: Request):
         print(f"[alert-webhook] error decoding payload: {e}")
     return Response(status_code=204)
 
+# The signing key is fixed for the process lifetime, so serialize the JWKS once
+JWKS_BODY = json.dumps(
+    {"keys": [make_jwk_from_signing_key(KID, SK)] if SK and KID else []},
+    separators=(",", ":"),
+).encode("utf-8")
+
 @app.get("/.well-known/jwks.json")
 def jwks():
-    keys = []
-    if SK and KID:
-        keys.append(make_jwk_from_signing_key(KID, SK))
-    return {"keys": keys}
+    return Response(content=JWKS_BODY, media_type="application/json")
 
 @app.post("/v1/admin/reload-reserved")
 def reload_reserved(x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key")):
@@ -128,12 +149,7 @@ def reload_reserved(x_signet_api_key: Optional[str] = Header(None, alias="X-SIGN
     of tenants and their reserved capacities. Any valid API key may call this; restrict
     at ingress if tighter control is required.
     """
-    api_key = x_signet_api_key
-    if not api_key:
-        raise HTTPException(status_code=401, detail="missing api key header")
-    tenant_cfg = SET.api_keys.get(api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
+    resolve_tenant(x_signet_api_key)
     from .pipeline.billing import BillingBuffer
     BB = BillingBuffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
     summary = {}
@@ -142,14 +158,24 @@ def reload_reserved(x_signet_api_key: Optional[str] = Header(None, alias="X-SIGN
     return {"reloaded": True, "tenants": len(summary), "capacities": summary}
 
 @app.get("/v1/receipts/chain/{trace_id}")
-def get_chain(trace_id: str):
-    return STORE.get_chain(trace_id)
+def get_chain(trace_id: str, if_none_match: Optional[str] = Header(None, alias="If-None-Match")):
+    # The head hash identifies the chain's current state, so pollers can revalidate cheaply
+    if if_none_match:
+        head = STORE.get_head(trace_id)
+        if head and if_none_match == f'"{head["last_receipt_hash"]}"':
+            return Response(status_code=304, headers={"ETag": if_none_match})
+    chain = STORE.get_chain(trace_id)
+    headers = {"ETag": f'"{chain[-1]["receipt_hash"]}"'} if chain else None
+    return JSONResponse(chain, headers=headers)
 
 @app.get("/v1/receipts/export/{trace_id}")
 def export_chain(trace_id: str, response: Response):
     chain = STORE.get_chain(trace_id)
     if not chain:
         raise HTTPException(status_code=404, detail="trace not found")
+    # Never sign a bundle over a chain whose stored hashes or links don't check out
+    if not verify_chain_hashes(chain):
+        raise HTTPException(status_code=500, detail="receipt chain failed integrity check")
     bundle = {"trace_id": trace_id, "chain": chain, "exported_at": utcnow()}
     if SK and KID:
         signed = sign_export_bundle(SK, KID, bundle)
@@ -159,20 +185,19 @@ def export_chain(trace_id: str, response: Response):
     return bundle
 
 # MCP-Enhanced Billing Endpoints
+async def enhanced_billing_buffer():
+    """Build the MCP billing buffer in the threadpool; it reads the reserved config from disk"""
+    from .pipeline.billing_mcp import create_enhanced_billing_buffer
+    return await run_in_threadpool(create_enhanced_billing_buffer, STORE, SET.stripe_api_key, SET.reserved_config_path)
+
 @app.post("/v1/billing/setup-products")
 async def setup_stripe_products(
     x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key")
 ):
     """Set up Stripe products and pricing using MCP"""
-    if not x_signet_api_key:
-        raise HTTPException(status_code=401, detail="missing api key header")
-    
-    tenant_cfg = SET.api_keys.get(x_signet_api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
+    resolve_tenant(x_signet_api_key)
     
-    from .pipeline.billing_mcp import create_enhanced_billing_buffer
-    BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    BB = await enhanced_billing_buffer()
     
     result = await BB.setup_signet_products()
     return result
@@ -184,15 +209,9 @@ async def create_payment_link(
     x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key")
 ):
     """Create a payment link for a tenant's subscription"""
-    if not x_signet_api_key:
-        raise HTTPException(status_code=401, detail="missing api key header")
+    resolve_tenant(x_signet_api_key)
     
-    tenant_cfg = SET.api_keys.get(x_signet_api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
-    
-    from .pipeline.billing_mcp import create_enhanced_billing_buffer
-    BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    BB = await enhanced_billing_buffer()
     
     result = await BB.create_customer_payment_link(tenant, plan_type)
     return result
@@ -202,15 +221,9 @@ async def get_billing_dashboard(
     x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key")
 ):
     """Get comprehensive billing dashboard data"""
-    if not x_signet_api_key:
-        raise HTTPException(status_code=401, detail="missing api key header")
+    resolve_tenant(x_signet_api_key)
     
-    tenant_cfg = SET.api_keys.get(x_signet_api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
-    
-    from .pipeline.billing_mcp import create_enhanced_billing_buffer
-    BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    BB = await enhanced_billing_buffer()
     
     result = await BB.get_billing_dashboard_data()
     return result
@@ -220,19 +233,16 @@ async def sync_stripe_items(
     x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key")
 ):
     """Sync Stripe subscription items with configuration"""
-    if not x_signet_api_key:
-        raise HTTPException(status_code=401, detail="missing api key header")
-    
-    tenant_cfg = SET.api_keys.get(x_signet_api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
+    resolve_tenant(x_signet_api_key)
     
-    from .pipeline.billing_mcp import create_enhanced_billing_buffer
-    BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    BB = await enhanced_billing_buffer()
     
     result = await BB.sync_stripe_items_with_config()
     return result
 
+# Upper bound on exchanges accepted by a single /v1/exchange:batch request
+MAX_BATCH_EXCHANGES = 100
+
 @app.post("/v1/exchange")
 def exchange(
     req: Request,
@@ -242,7 +252,6 @@ def exchange(
     x_odin_idempotency_key: Optional[str] = Header(None, alias="X-ODIN-Idempotency-Key"),
     x_signet_idempotency_key: Optional[str] = Header(None, alias="X-SIGNET-Idempotency-Key"),
 ):
-    t0 = time.time()
     # Auth (accept either header)
     api_key = x_odin_api_key or x_signet_api_key
     idem_key = x_odin_idempotency_key or x_signet_idempotency_key
@@ -251,16 +260,76 @@ def exchange(
     if not idem_key:
         raise HTTPException(status_code=400, detail="missing idempotency header")
 
-    tenant_cfg = SET.api_keys.get(api_key)
-    if not tenant_cfg:
-        raise HTTPException(status_code=401, detail="invalid api key")
+    tenant_cfg = resolve_tenant(api_key)
+
+    resp, idempotent_hit = run_exchange(api_key, tenant_cfg, idem_key, body)
+    if idempotent_hit:
+        return JSONResponse(resp, headers={"X-SIGNET-Idempotency-Hit": "1"})
+    trace_id = resp["trace_id"]
+    headers = {"X-SIGNET-Trace": trace_id, "X-ODIN-Trace": trace_id}
+    return JSONResponse(resp, headers=headers)
+
+@app.post("/v1/exchange:batch")
+def exchange_batch(
+    body: Dict[str, Any],
+    x_odin_api_key: Optional[str] = Header(None, alias="X-ODIN-API-Key"),
+    x_signet_api_key: Optional[str] = Header(None, alias="X-SIGNET-API-Key"),
+    x_odin_idempotency_key: Optional[str] = Header(None, alias="X-ODIN-Idempotency-Key"),
+    x_signet_idempotency_key: Optional[str] = Header(None, alias="X-SIGNET-Idempotency-Key"),
+):
+    """Run several exchanges in one request to amortize connection and auth overhead.
+
+    Body: {"exchanges": [<exchange body> + optional "idempotency_key", ...]}. Items
+    without their own key use "<batch idempotency header>:<index>". Each item is
+    processed exactly like POST /v1/exchange; failures are reported per item and do
+    not abort the rest of the batch.
+    """
+    api_key = x_odin_api_key or x_signet_api_key
+    batch_idem_key = x_odin_idempotency_key or x_signet_idempotency_key
+    tenant_cfg = resolve_tenant(api_key)
+
+    items = body.get("exchanges")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=422, detail="missing exchanges")
+    if len(items) > MAX_BATCH_EXCHANGES:
+        raise HTTPException(status_code=413, detail=f"batch exceeds {MAX_BATCH_EXCHANGES} exchanges")
+
+    results = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({"idempotency_key": None, "status_code": 422, "detail": "exchange must be an object"})
+            continue
+        item = dict(item)
+        idem_key = item.pop("idempotency_key", None) or (f"{batch_idem_key}:{i}" if batch_idem_key else None)
+        if not idem_key:
+            results.append({"idempotency_key": None, "status_code": 400, "detail": "missing idempotency key"})
+            continue
+        try:
+            resp, idempotent_hit = run_exchange(api_key, tenant_cfg, idem_key, item)
+        except HTTPException as e:
+            results.append({"idempotency_key": idem_key, "status_code": e.status_code, "detail": e.detail})
+            continue
+        results.append({
+            "idempotency_key": idem_key,
+            "status_code": 200,
+            "idempotent_hit": idempotent_hit,
+            "response": resp,
+        })
+    return {"results": results}
+
+def run_exchange(api_key: str, tenant_cfg, idem_key: str, body: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Run one exchange through the pipeline for an authenticated tenant.
+
+    Returns (response body, idempotent_hit). Raises HTTPException on rejection.
+    """
+    t0 = time.time()
 
     # Idempotency
     with phase("idempotency"):
         cached = STORE.get_idempotent(api_key, idem_key)
         if cached:
             idempotent_hits_total.inc()
-            return JSONResponse(cached, headers={"X-SIGNET-Idempotency-Hit": "1"})
+            return cached, True
 
     # Sanitize
     with phase("sanitize"):
@@ -404,23 +473,31 @@ def exchange(
 
     # Usage & billing (VEx = 1; FU tokens counted)
     with phase("record_usage"):
-        STORE.record_usage(api_key, tenant_cfg.tenant, trace_id, hop, True, 1, fu_tokens_used, receipt["ts"])
+        USAGE.record(api_key, tenant_cfg.tenant, trace_id, hop, True, 1, fu_tokens_used, receipt["ts"])
         vex_units_total.inc()
         if fu_tokens_used:
             fu_tokens_total.inc(fu_tokens_used)
-    from .pipeline.billing_mcp import create_enhanced_billing_buffer
-    BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    bill_vex = bool(tenant_cfg.stripe_item_vex)
+    bill_fu = fu_tokens_used > 0 and bool(tenant_cfg.stripe_item_fu)
+    # Without Stripe the buffer would drop every event, so skip building it (and parsing reserved config)
+    BB = None
+    if SET.stripe_api_key and (bill_vex or bill_fu):
+        from .pipeline.billing_mcp import create_enhanced_billing_buffer
+        BB = create_enhanced_billing_buffer(STORE, SET.stripe_api_key, SET.reserved_config_path)
+    bill_ts = int(time.time())
     
     # Bill for VEx (Verified Exchange)
-    if tenant_cfg.stripe_item_vex:
+    if bill_vex:
         with phase("billing_enqueue_vex"):
-            BB.enqueue_vex(api_key, tenant_cfg.stripe_item_vex, units=1, tenant=tenant_cfg.tenant)
+            if BB is not None:
+                BB.enqueue_vex(api_key, tenant_cfg.stripe_item_vex, units=1, tenant=tenant_cfg.tenant, ts=bill_ts)
             billing_enqueue_total.labels(type="vex").inc()
     
     # Bill for FU (Fallback Units) if used
-    if fu_tokens_used > 0 and tenant_cfg.stripe_item_fu:
+    if bill_fu:
         with phase("billing_enqueue_fu"):
-            BB.enqueue_fu(api_key, tenant_cfg.stripe_item_fu, fu_tokens_used, tenant=tenant_cfg.tenant)
+            if BB is not None:
+                BB.enqueue_fu(api_key, tenant_cfg.stripe_item_fu, fu_tokens_used, tenant=tenant_cfg.tenant, ts=bill_ts)
             billing_enqueue_total.labels(type="fu").inc()
 
     resp = {
@@ -446,5 +523,4 @@ def exchange(
     total_latency = time.time() - t0
     latency_total_hist.observe(total_latency)
     phase_latency_hist.labels(phase="total").observe(total_latency)
-    headers = {"X-SIGNET-Trace": trace_id, "X-ODIN-Trace": trace_id}
-    return JSONResponse(resp, headers=headers)
+    return resp, False
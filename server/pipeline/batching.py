@@ -0,0 +1,117 @@
+import threading, time
+from typing import Callable, List, Tuple
+
+class BatchWriter:
+    """Coalesces single-row inserts into batched transactions.
+
+    Rows are handed to `write_many` once `max_batch` are waiting or `max_delay`
+    seconds after the first arrived, so the commit (and fsync) cost is paid per
+    batch instead of per row. The writer thread exits after `idle_timeout`
+    seconds without work and is restarted by the next row. Rows whose write
+    fails are put back at the front of the queue and retried with exponential
+    backoff (capped at `max_backoff`); after `max_retries` consecutive failures
+    the batch is dropped and counted in `dropped`.
+    """
+    kind = "rows"
+    # Minimum seconds between repeated failure warnings
+    warn_interval = 30.0
+
+    def __init__(self, write_many: Callable[[List[Tuple]], None], max_batch: int = 500,
+                 max_delay: float = 0.05, idle_timeout: float = 5.0,
+                 max_retries: int = 8, max_backoff: float = 30.0):
+        self.write_many = write_many
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.idle_timeout = idle_timeout
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.dropped = 0
+        self._rows = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._failures = 0
+        self._last_warning = None
+        self._suppressed = 0
+
+    def add(self, row: Tuple):
+        with self._cond:
+            self._rows.append(row)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"signet-{self.kind}-writer", daemon=True)
+                self._thread.start()
+            elif len(self._rows) == 1 or len(self._rows) >= self.max_batch:
+                # Wake an idle writer so the row goes out within max_delay, or a full batch now
+                self._cond.notify()
+
+    def flush(self) -> int:
+        """Write every waiting row now; returns how many were written."""
+        with self._cond:
+            rows, self._rows = self._rows, []
+        self._write(rows)
+        return len(rows)
+
+    def _retry_delay(self) -> float:
+        if not self._failures:
+            return self.max_delay
+        return min(self.max_delay * (2 ** self._failures), self.max_backoff)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._rows:
+                    self._cond.wait(self.idle_timeout)
+                    if not self._rows:
+                        self._thread = None
+                        return
+                deadline = time.monotonic() + self._retry_delay()
+                # A full batch goes out early, but never ahead of a retry backoff
+                while self._failures or len(self._rows) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                rows, self._rows = self._rows, []
+            self._write(rows)
+
+    def _write(self, rows):
+        if not rows:
+            return
+        try:
+            self.write_many(rows)
+        except Exception as e:
+            with self._cond:
+                self._failures += 1
+                if self._failures % self.max_retries == 0:
+                    self.dropped += len(rows)
+                    self._warn(f"Warning: Dropped {len(rows)} {self.kind} after {self.max_retries} failed writes: {e}")
+                else:
+                    self._rows[:0] = rows
+                    self._warn(f"Warning: Failed to write {len(rows)} {self.kind}, will retry: {e}")
+        else:
+            if self._failures:
+                with self._cond:
+                    self._failures = 0
+
+    def _warn(self, message: str):
+        # Called with self._cond held; a persistently failing store logs once per warn_interval
+        now = time.monotonic()
+        if self._last_warning is not None and now - self._last_warning < self.warn_interval:
+            self._suppressed += 1
+            return
+        if self._suppressed:
+            message += f" ({self._suppressed} similar warnings suppressed)"
+        print(message)
+        self._last_warning = now
+        self._suppressed = 0
+
+class UsageWriter(BatchWriter):
+    """Buffers usage_ledger rows; up to `max_delay` of usage is lost on a crash
+    (longer while the store is failing and writes are backing off)."""
+    kind = "usage"
+
+    def __init__(self, storage, max_batch: int = 100, max_delay: float = 0.1, idle_timeout: float = 5.0):
+        super().__init__(storage.record_usage_many, max_batch, max_delay, idle_timeout)
+        self.storage = storage
+
+    def record(self, api_key: str, tenant: str, trace_id: str, hop: int, verified: bool, vex_units: int, fu_tokens: int, ts: str):
+        self.add((api_key, tenant, trace_id, hop, 1 if verified else 0, vex_units, fu_tokens, ts))
@@ -1,15 +1,49 @@
-import os, time, json
+import os, time, json, atexit, threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, Tuple
-from datetime import datetime, timezone
 from prometheus_client import Counter, Gauge
 from ..settings import load_settings
 from .metrics import update_reserved_capacity
 from .storage import Storage
+from .batching import BatchWriter
 
 billing_enqueued = Counter("signet_billing_enqueued_total", "Billing events enqueued", ["type"])
 reserved_capacity_gauge = Gauge("signet_reserved_capacity", "Reserved capacity by tenant and type", ["tenant", "type"])
 overage_charges = Counter("signet_overage_charges_total", "Overage charges applied", ["tenant", "type", "tier"])
 
+class BillingQueueWriter(BatchWriter):
+    """Batches billing_queue inserts for one storage (see BatchWriter)."""
+    kind = "billing"
+
+    def __init__(self, storage, max_batch: int = 500, max_delay: float = 0.05, idle_timeout: float = 5.0):
+        super().__init__(storage.enqueue_billing_many, max_batch, max_delay, idle_timeout)
+        self.storage = storage
+
+    def put(self, api_key: str, stripe_item: str, units: int, ts_unix: int):
+        self.add((api_key, stripe_item, units, ts_unix))
+
+# One writer per storage, kept on the storage itself: BillingBuffer is created per
+# request and the queue must outlive it. _WRITERS lists every writer for the
+# process lifetime so pending rows are flushed at exit.
+_WRITERS = []
+_WRITERS_LOCK = threading.Lock()
+
+def billing_writer(storage) -> BillingQueueWriter:
+    with _WRITERS_LOCK:
+        writer = getattr(storage, "_billing_writer", None)
+        if writer is None:
+            writer = storage._billing_writer = BillingQueueWriter(storage)
+            _WRITERS.append(writer)
+        return writer
+
+@atexit.register
+def _flush_billing_writers():
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS)
+    for writer in writers:
+        writer.flush()
+
 class ReservedCapacity:
     """Configuration for reserved monthly capacity and overage tiers"""
     
@@ -20,6 +54,11 @@ class ReservedCapacity:
         # Overage tiers: list of {"threshold": int, "price_per_unit": float, "stripe_item": str}
         self.vex_overage_tiers = config.get("vex_overage_tiers", [])
         self.fu_overage_tiers = config.get("fu_overage_tiers", [])
+        # Tiers are static per config; sort once instead of on every overage calculation
+        self.vex_tiers_sorted = sorted(self.vex_overage_tiers, key=lambda t: t["threshold"])
+        self.fu_tiers_sorted = sorted(self.fu_overage_tiers, key=lambda t: t["threshold"])
+        self.vex_thresholds = [t["threshold"] for t in self.vex_tiers_sorted]
+        self.fu_thresholds = [t["threshold"] for t in self.fu_tiers_sorted]
         
         # Stripe items for reserved capacity billing
         self.vex_reserved_item = config.get("vex_reserved_item")
@@ -45,8 +84,8 @@ class UsageTracker:
         vex_overage = max(0, usage["vex_used"] - reserved.vex_reserved)
         fu_overage = max(0, usage["fu_used"] - reserved.fu_reserved)
         
-        vex_charges = self._calculate_tier_charges(vex_overage, reserved.vex_overage_tiers)
-        fu_charges = self._calculate_tier_charges(fu_overage, reserved.fu_overage_tiers)
+        vex_charges = self._calculate_tier_charges(vex_overage, reserved.vex_overage_tiers, reserved.vex_tiers_sorted)
+        fu_charges = self._calculate_tier_charges(fu_overage, reserved.fu_overage_tiers, reserved.fu_tiers_sorted)
         
         return {
             "vex_overage": vex_overage,
@@ -56,15 +95,17 @@ class UsageTracker:
             "total_overage_cost": sum(c["cost"] for c in vex_charges + fu_charges)
         }
     
-    def _calculate_tier_charges(self, overage_units: int, tiers: list) -> list:
+    def _calculate_tier_charges(self, overage_units: int, tiers: list, sorted_tiers: Optional[list] = None) -> list:
         """Calculate charges across multiple pricing tiers"""
         if not overage_units or not tiers:
             return []
+        if sorted_tiers is None:
+            sorted_tiers = sorted(tiers, key=lambda t: t["threshold"])
         
         charges = []
         remaining = overage_units
         
-        for tier in sorted(tiers, key=lambda t: t["threshold"]):
+        for tier in sorted_tiers:
             if remaining <= 0:
                 break
                 
@@ -93,10 +134,13 @@ class UsageTracker:
         return charges
 
 class BillingBuffer:
+    flush_workers = 16
+
     def __init__(self, storage: Storage, stripe_api_key: Optional[str], reserved_config_path: Optional[str] = None):
         self.storage = storage
         self.enabled = bool(stripe_api_key)
         self.usage_tracker = UsageTracker(storage)
+        self.writer = billing_writer(storage)
         
         if self.enabled:
             import stripe
@@ -131,44 +175,50 @@ class BillingBuffer:
             print(f"Warning: Failed to load reserved capacity config: {e}")
             return {}
 
-    def enqueue_vex(self, api_key: str, stripe_item: Optional[str], units: int = 1, tenant: Optional[str] = None):
+    def enqueue_vex(self, api_key: str, stripe_item: Optional[str], units: int = 1, tenant: Optional[str] = None,
+                    ts: Optional[int] = None):
         if not (self.enabled and stripe_item):
             return
+        if ts is None:
+            ts = int(time.time())
         
         # Check for reserved capacity and overage billing
         if tenant and tenant in self.reserved_configs:
-            billing_item, billing_units = self._calculate_vex_billing(tenant, units)
+            billing_item, billing_units = self._calculate_vex_billing(tenant, units, ts)
             if billing_item:
-                self.storage.enqueue_billing(api_key, billing_item, billing_units, int(time.time()))
+                self.writer.put(api_key, billing_item, billing_units, ts)
         else:
             # Standard per-unit billing
-            self.storage.enqueue_billing(api_key, stripe_item, units, int(time.time()))
+            self.writer.put(api_key, stripe_item, units, ts)
         
         billing_enqueued.labels(type="vex").inc()
 
-    def enqueue_fu(self, api_key: str, stripe_item: Optional[str], tokens: int, tenant: Optional[str] = None):
+    def enqueue_fu(self, api_key: str, stripe_item: Optional[str], tokens: int, tenant: Optional[str] = None,
+                   ts: Optional[int] = None):
         if not (self.enabled and stripe_item and tokens > 0):
             return
+        if ts is None:
+            ts = int(time.time())
         
         # Check for reserved capacity and overage billing
         if tenant and tenant in self.reserved_configs:
-            billing_item, billing_units = self._calculate_fu_billing(tenant, tokens)
+            billing_item, billing_units = self._calculate_fu_billing(tenant, tokens, ts)
             if billing_item:
-                self.storage.enqueue_billing(api_key, billing_item, billing_units, int(time.time()))
+                self.writer.put(api_key, billing_item, billing_units, ts)
         else:
             # Standard per-token billing
-            self.storage.enqueue_billing(api_key, stripe_item, tokens, int(time.time()))
+            self.writer.put(api_key, stripe_item, tokens, ts)
         
         billing_enqueued.labels(type="fu").inc()
 
-    def _calculate_vex_billing(self, tenant: str, units: int) -> Tuple[Optional[str], int]:
+    def _calculate_vex_billing(self, tenant: str, units: int, ts: Optional[int] = None) -> Tuple[Optional[str], int]:
         """Calculate VEx billing considering reserved capacity"""
         reserved = self.reserved_configs.get(tenant)
         if not reserved:
             return None, 0
         
-        now = datetime.now(timezone.utc)
-        usage = self.usage_tracker.get_monthly_usage(tenant, now.year, now.month)
+        year, month = time.gmtime(ts)[:2]
+        usage = self.usage_tracker.get_monthly_usage(tenant, year, month)
         
         # If within reserved capacity, no additional billing
         if usage["vex_used"] + units <= reserved.vex_reserved:
@@ -177,22 +227,23 @@ class BillingBuffer:
         # Calculate overage
         overage_units = max(0, (usage["vex_used"] + units) - reserved.vex_reserved)
         if overage_units > 0:
-            # Find appropriate tier
-            for tier in reserved.vex_overage_tiers:
-                if overage_units <= tier["threshold"]:
-                    overage_charges.labels(tenant=tenant, type="vex", tier=tier["threshold"]).inc()
-                    return tier["stripe_item"], overage_units
+            # Find the smallest tier that covers the overage
+            i = bisect_left(reserved.vex_thresholds, overage_units)
+            if i < len(reserved.vex_tiers_sorted):
+                tier = reserved.vex_tiers_sorted[i]
+                overage_charges.labels(tenant=tenant, type="vex", tier=tier["threshold"]).inc()
+                return tier["stripe_item"], overage_units
         
         return None, 0
 
-    def _calculate_fu_billing(self, tenant: str, tokens: int) -> Tuple[Optional[str], int]:
+    def _calculate_fu_billing(self, tenant: str, tokens: int, ts: Optional[int] = None) -> Tuple[Optional[str], int]:
         """Calculate FU billing considering reserved capacity"""
         reserved = self.reserved_configs.get(tenant)
         if not reserved:
             return None, 0
         
-        now = datetime.now(timezone.utc)
-        usage = self.usage_tracker.get_monthly_usage(tenant, now.year, now.month)
+        year, month = time.gmtime(ts)[:2]
+        usage = self.usage_tracker.get_monthly_usage(tenant, year, month)
         
         # If within reserved capacity, no additional billing
         if usage["fu_used"] + tokens <= reserved.fu_reserved:
@@ -201,11 +252,12 @@ class BillingBuffer:
         # Calculate overage
         overage_tokens = max(0, (usage["fu_used"] + tokens) - reserved.fu_reserved)
         if overage_tokens > 0:
-            # Find appropriate tier
-            for tier in reserved.fu_overage_tiers:
-                if overage_tokens <= tier["threshold"]:
-                    overage_charges.labels(tenant=tenant, type="fu", tier=tier["threshold"]).inc()
-                    return tier["stripe_item"], overage_tokens
+            # Find the smallest tier that covers the overage
+            i = bisect_left(reserved.fu_thresholds, overage_tokens)
+            if i < len(reserved.fu_tiers_sorted):
+                tier = reserved.fu_tiers_sorted[i]
+                overage_charges.labels(tenant=tenant, type="fu", tier=tier["threshold"]).inc()
+                return tier["stripe_item"], overage_tokens
         
         return None, 0
 
@@ -236,24 +288,31 @@ class BillingBuffer:
     def flush_once(self, batch_size: int = 100, max_retries: int = 5):
         if not self.enabled:
             return {"flushed": 0, "enabled": False}
+        self.writer.flush()
         items = self.storage.dequeue_billing_batch(batch_size)
         if not items:
             return {"flushed": 0, "enabled": True}
         ok_ids, retry_ids = [], []
-        for it in items:
-            try:
-                self.stripe.UsageRecord.create(
-                    quantity=it["units"],
-                    timestamp=it["ts"],
+        # Each usage record is its own HTTPS round trip, so post them concurrently
+        with ThreadPoolExecutor(max_workers=min(self.flush_workers, len(items))) as pool:
+            futures = {
+                pool.submit(
+                    self.stripe.UsageRecord.create,
+                    quantity=units,
+                    timestamp=ts,
                     action="increment",
-                    subscription_item=it["stripe_item"]
-                )
-                ok_ids.append(it["id"])
-            except Exception:
-                if it["retries"] + 1 >= max_retries:
-                    ok_ids.append(it["id"])  # drop
+                    subscription_item=stripe_item
+                ): (item_id, retries)
+                for item_id, stripe_item, units, ts, retries in items
+            }
+            for fut in as_completed(futures):
+                item_id, retries = futures[fut]
+                if fut.exception() is None:
+                    ok_ids.append(item_id)
+                elif retries + 1 >= max_retries:
+                    ok_ids.append(item_id)  # drop
                 else:
-                    retry_ids.append(it["id"])
+                    retry_ids.append(item_id)
         if ok_ids:
             self.storage.delete_billing_items(ok_ids)
         if retry_ids:
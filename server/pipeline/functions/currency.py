@@ -3,9 +3,21 @@ from typing import Optional
 MINOR_UNITS = {
     "USD": 2, "EUR": 2, "GBP": 2, "JPY": 0, "CNY": 2, "AUD": 2, "CAD": 2, "INR": 2
 }
+_POW10 = (1, 10, 100, 1000, 10000, 100000, 1000000)
+_minor_units = MINOR_UNITS.get
+
 def to_minor(amount, currency: str) -> int:
-    currency = (currency or "").upper()
-    scale = MINOR_UNITS.get(currency, 2)
+    scale = _minor_units((currency or "").upper(), 2)
+    if scale < len(_POW10):
+        amount_type = type(amount)
+        if amount_type is int:
+            return amount * _POW10[scale]
+        if amount_type is float:
+            # Scale the shortest repr exactly, as Decimal(str(amount)) would
+            text = repr(amount)
+            whole, _, frac = text.partition(".")
+            if len(frac) <= scale and "e" not in text and "n" not in text:
+                return int(whole + frac) * _POW10[scale - len(frac)]
     d = Decimal(str(amount))
     q = Decimal(10) ** scale
     minor = int((d * q).to_integral_exact(rounding=ROUND_DOWN))
@@ -1,5 +1,11 @@
-from typing import Dict, Any, Optional
-from ..utils.jcs import canonicalize, cid_for_json, sha256_hexdigest
+import hashlib, hmac
+from typing import Dict, Any, List, Optional
+from ..utils.clock import utcnow_iso
+from ..utils.jcs import canonicalize_bytes, cid_for_json, sha256_hexdigest
+
+_sha256 = hashlib.sha256
+# A receipt's hash covers every field except the hash itself
+_HASH_EXCLUDE = frozenset(("receipt_hash",))
 
 def make_receipt(trace_id: str, hop: int, tenant: str, cid: str, policy: Dict[str, Any], prev_receipt_hash: Optional[str]) -> Dict[str, Any]:
     base = {
@@ -13,15 +19,29 @@ def make_receipt(trace_id: str, hop: int, tenant: str, cid: str, policy: Dict[st
         "prev_receipt_hash": prev_receipt_hash,
         "policy": policy,
     }
-    canon = canonicalize(base).encode("utf-8")
+    canon = canonicalize_bytes(base)
     rhash = "sha256:" + __sha256_hex(canon)
     base["receipt_hash"] = rhash
     return base
 
+def verify_chain_hashes(chain: List[Dict[str, Any]]) -> bool:
+    """Recompute every receipt hash in a stored chain and check the prev links.
+
+    All receipts are canonicalized first so the hashing loop only calls into
+    hashlib (which drops the GIL for large buffers).
+    """
+    bufs = [canonicalize_bytes(r, _HASH_EXCLUDE) for r in chain]
+    prev = None
+    for stored, buf in zip(chain, bufs, strict=True):
+        if not hmac.compare_digest(stored["receipt_hash"], "sha256:" + _sha256(buf).hexdigest()):
+            return False
+        if stored.get("prev_receipt_hash") != prev:
+            return False
+        prev = stored["receipt_hash"]
+    return True
+
 def __sha256_hex(b: bytes) -> str:
-    import hashlib
-    return hashlib.sha256(b).hexdigest()
+    return _sha256(b).hexdigest()
 
 def __utcnow():
-    import time
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return utcnow_iso()
@@ -1,5 +1,10 @@
 import sqlite3, json, os, threading
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 INIT_SQL = """
 PRAGMA journal_mode=WAL;
@@ -49,27 +54,102 @@ CREATE TABLE IF NOT EXISTS billing_queue(
 );
 """
 
+# Per-connection settings (journal_mode=WAL persists in the database file itself)
+CONN_PRAGMAS = "PRAGMA foreign_keys=ON;"
+
+# Hot-path statements kept as constants so each connection's statement cache reuses their plans
+SQL_GET_HEAD = "SELECT trace_id,last_hop,last_receipt_hash FROM heads WHERE trace_id=?"
+SQL_INSERT_RECEIPT = """INSERT INTO receipts(trace_id,hop,ts,cid,canon,algo,prev_receipt_hash,policy_json,tenant,receipt_hash)
+                         VALUES(?,?,?,?,?,?,?,?,?,?)"""
+SQL_UPDATE_HEAD = "UPDATE heads SET last_hop=?, last_receipt_hash=? WHERE trace_id=?"
+SQL_INSERT_HEAD = "INSERT INTO heads(trace_id,last_hop,last_receipt_hash) VALUES(?,?,?)"
+# Create the head at hop 1, or advance it only if it still points at the expected
+# previous receipt; no row comes back when that optimistic check fails
+SQL_ADVANCE_HEAD = """INSERT INTO heads(trace_id,last_hop,last_receipt_hash) VALUES(?,1,?)
+                      ON CONFLICT(trace_id) DO UPDATE SET last_hop=heads.last_hop+1,
+                          last_receipt_hash=excluded.last_receipt_hash
+                      WHERE heads.last_receipt_hash=?
+                      RETURNING last_hop"""
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SQL_PUT_IDEMPOTENT = "INSERT OR REPLACE INTO idempotency(api_key,key,response_json) VALUES(?,?,?)"
+SQL_GET_IDEMPOTENT = "SELECT response_json FROM idempotency WHERE api_key=? AND key=?"
+SQL_RECORD_USAGE = """INSERT INTO usage_ledger(api_key,tenant,trace_id,hop,verified,vex_units,fu_tokens,ts)
+                         VALUES(?,?,?,?,?,?,?,?)"""
+SQL_ENQUEUE_BILLING = """INSERT INTO billing_queue(api_key,stripe_item,units,ts,retries)
+                         VALUES(?,?,?,?,0)"""
+SQL_DEQUEUE_BILLING = "SELECT id,stripe_item,units,ts,retries FROM billing_queue ORDER BY id ASC LIMIT ?"
+
+SQL_GET_CHAIN = "SELECT * FROM receipts WHERE trace_id=? ORDER BY hop ASC"
+
+# Policies are small server-built dicts, so the faster orjson codec is safe for them
+if orjson is not None:
+    def dumps_policy(policy: Dict[str, Any]) -> str:
+        return orjson.dumps(policy).decode("utf-8")
+    loads_policy = orjson.loads
+else:
+    def dumps_policy(policy: Dict[str, Any]) -> str:
+        return json.dumps(policy)
+    loads_policy = json.loads
+
+def receipt_from_row(r) -> Dict[str, Any]:
+    return {
+        "trace_id": r["trace_id"],
+        "hop": r["hop"],
+        "ts": r["ts"],
+        "cid": r["cid"],
+        "canon": r["canon"],
+        "algo": r["algo"],
+        "prev_receipt_hash": r["prev_receipt_hash"],
+        "policy": loads_policy(r["policy_json"]),
+        "tenant": r["tenant"],
+        "receipt_hash": r["receipt_hash"]
+    }
+
 class Storage:
     def __init__(self, path: str):
         os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
         self.path = path
+        # One connection per thread, opened lazily and reused for every call on that thread
+        self._local = threading.local()
+        # SQLite allows a single writer; queue writers here instead of in its busy-wait loop
+        self._write_lock = threading.Lock()
         with self._conn() as c:
             c.executescript(INIT_SQL)
 
     def _conn(self):
-        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(CONN_PRAGMAS)
+            self._local.conn = conn
         return conn
 
     def get_head(self, trace_id: str):
         with self._conn() as c:
-            row = c.execute("SELECT trace_id,last_hop,last_receipt_hash FROM heads WHERE trace_id=?", (trace_id,)).fetchone()
+            row = c.execute(SQL_GET_HEAD, (trace_id,)).fetchone()
             return dict(row) if row else None
 
     def append_receipt(self, receipt: Dict[str, Any], expected_prev: Optional[str]) -> int:
-        with self._conn() as c:
+        with self._write_lock, self._conn() as c:
             c.execute("BEGIN IMMEDIATE")
-            head = c.execute("SELECT trace_id,last_hop,last_receipt_hash FROM heads WHERE trace_id=?", (receipt["trace_id"],)).fetchone()
+            if HAS_RETURNING:
+                row = c.execute(SQL_ADVANCE_HEAD, (receipt["trace_id"], receipt["receipt_hash"], expected_prev)).fetchone()
+                if row is None:
+                    c.execute("ROLLBACK")
+                    raise StorageConflict("prev_receipt_hash mismatch")
+                hop = row[0]
+                if hop == 1 and expected_prev is not None:
+                    c.execute("ROLLBACK")
+                    raise StorageConflict("unexpected prev_receipt_hash")
+                receipt["hop"] = hop
+                c.execute(SQL_INSERT_RECEIPT,
+                          (receipt["trace_id"], hop, receipt["ts"], receipt["cid"], receipt["canon"], receipt["algo"],
+                           receipt.get("prev_receipt_hash"), dumps_policy(receipt["policy"]), receipt["tenant"], receipt["receipt_hash"]))
+                c.execute("COMMIT")
+                return hop
+            head = c.execute(SQL_GET_HEAD, (receipt["trace_id"],)).fetchone()
             if head:
                 if head["last_receipt_hash"] != expected_prev:
                     c.execute("ROLLBACK")
@@ -81,75 +161,98 @@ class Storage:
                     raise StorageConflict("unexpected prev_receipt_hash")
                 hop = 1
             receipt["hop"] = hop
-            c.execute("""INSERT INTO receipts(trace_id,hop,ts,cid,canon,algo,prev_receipt_hash,policy_json,tenant,receipt_hash)
-                         VALUES(?,?,?,?,?,?,?,?,?,?)""",
+            c.execute(SQL_INSERT_RECEIPT,
                       (receipt["trace_id"], hop, receipt["ts"], receipt["cid"], receipt["canon"], receipt["algo"],
-                       receipt.get("prev_receipt_hash"), json.dumps(receipt["policy"]), receipt["tenant"], receipt["receipt_hash"]))
+                       receipt.get("prev_receipt_hash"), dumps_policy(receipt["policy"]), receipt["tenant"], receipt["receipt_hash"]))
             if head:
-                c.execute("UPDATE heads SET last_hop=?, last_receipt_hash=? WHERE trace_id=?", (hop, receipt["receipt_hash"], receipt["trace_id"]))
+                c.execute(SQL_UPDATE_HEAD, (hop, receipt["receipt_hash"], receipt["trace_id"]))
             else:
-                c.execute("INSERT INTO heads(trace_id,last_hop,last_receipt_hash) VALUES(?,?,?)", (receipt["trace_id"], hop, receipt["receipt_hash"]))
+                c.execute(SQL_INSERT_HEAD, (receipt["trace_id"], hop, receipt["receipt_hash"]))
             c.execute("COMMIT")
             return hop
 
+    def iter_chain(self, trace_id: str, batch_size: int = 256) -> Iterator[Dict[str, Any]]:
+        """Yield a trace's receipts in hop order without materializing the whole chain."""
+        cur = self._conn().execute(SQL_GET_CHAIN, (trace_id,))
+        try:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    return
+                for r in rows:
+                    yield receipt_from_row(r)
+        finally:
+            cur.close()
+
     def get_chain(self, trace_id: str):
-        with self._conn() as c:
-            rows = c.execute("SELECT * FROM receipts WHERE trace_id=? ORDER BY hop ASC", (trace_id,)).fetchall()
-            out = []
-            for r in rows:
-                out.append({
-                    "trace_id": r["trace_id"],
-                    "hop": r["hop"],
-                    "ts": r["ts"],
-                    "cid": r["cid"],
-                    "canon": r["canon"],
-                    "algo": r["algo"],
-                    "prev_receipt_hash": r["prev_receipt_hash"],
-                    "policy": json.loads(r["policy_json"]),
-                    "tenant": r["tenant"],
-                    "receipt_hash": r["receipt_hash"]
-                })
-            return out
+        return list(self.iter_chain(trace_id))
 
     def cache_idempotent(self, api_key: str, idem_key: str, response_json: Dict[str, Any]):
-        with self._conn() as c:
-            c.execute("INSERT OR REPLACE INTO idempotency(api_key,key,response_json) VALUES(?,?,?)",
-                      (api_key, idem_key, json.dumps(response_json)))
+        with self._write_lock, self._conn() as c:
+            c.execute(SQL_PUT_IDEMPOTENT, (api_key, idem_key, json.dumps(response_json)))
 
     def get_idempotent(self, api_key: str, idem_key: str):
         with self._conn() as c:
-            row = c.execute("SELECT response_json FROM idempotency WHERE api_key=? AND key=?", (api_key, idem_key)).fetchone()
+            row = c.execute(SQL_GET_IDEMPOTENT, (api_key, idem_key)).fetchone()
             if not row:
                 return None
             return json.loads(row["response_json"])
 
     def record_usage(self, api_key: str, tenant: str, trace_id: str, hop: int, verified: bool, vex_units: int, fu_tokens: int, ts: str):
-        with self._conn() as c:
-            c.execute("""INSERT INTO usage_ledger(api_key,tenant,trace_id,hop,verified,vex_units,fu_tokens,ts)
-                         VALUES(?,?,?,?,?,?,?,?)""",
+        with self._write_lock, self._conn() as c:
+            c.execute(SQL_RECORD_USAGE,
                       (api_key, tenant, trace_id, hop, 1 if verified else 0, vex_units, fu_tokens, ts))
 
+    def record_usage_many(self, rows):
+        """Insert usage_ledger rows (as passed to SQL_RECORD_USAGE) in one transaction."""
+        if not rows:
+            return
+        with self._write_lock, self._conn() as c:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.executemany(SQL_RECORD_USAGE, rows)
+            except Exception:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+
     def enqueue_billing(self, api_key: str, stripe_item: str, units: int, ts_unix: int):
-        with self._conn() as c:
-            c.execute("""INSERT INTO billing_queue(api_key,stripe_item,units,ts,retries)
-                         VALUES(?,?,?,?,0)""", (api_key, stripe_item, units, ts_unix))
+        with self._write_lock, self._conn() as c:
+            c.execute(SQL_ENQUEUE_BILLING, (api_key, stripe_item, units, ts_unix))
+
+    def enqueue_billing_many(self, rows):
+        """Insert (api_key, stripe_item, units, ts_unix) rows in one transaction."""
+        if not rows:
+            return
+        with self._write_lock, self._conn() as c:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.executemany(SQL_ENQUEUE_BILLING, rows)
+            except Exception:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
 
     def dequeue_billing_batch(self, limit: int = 100):
-        with self._conn() as c:
-            rows = c.execute("SELECT * FROM billing_queue ORDER BY id ASC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+        """Oldest queued events as (id, stripe_item, units, ts, retries) tuples."""
+        cur = self._conn().cursor()
+        cur.row_factory = None
+        try:
+            return cur.execute(SQL_DEQUEUE_BILLING, (limit,)).fetchall()
+        finally:
+            cur.close()
 
     def delete_billing_items(self, ids):
         if not ids:
             return
-        with self._conn() as c:
+        with self._write_lock, self._conn() as c:
             q = "DELETE FROM billing_queue WHERE id IN ({})".format(",".join("?"*len(ids)))
             c.execute(q, ids)
 
     def bump_billing_retries(self, ids):
         if not ids:
             return
-        with self._conn() as c:
+        with self._write_lock, self._conn() as c:
             q = "UPDATE billing_queue SET retries = retries + 1 WHERE id IN ({})".format(",".join("?"*len(ids)))
             c.execute(q, ids)
 
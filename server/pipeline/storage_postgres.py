@@ -2,8 +2,8 @@ import psycopg2
 import psycopg2.extras
 import json
 import os
-from typing import Optional, Dict, Any, List
-from .storage import StorageConflict
+from typing import Optional, Dict, Any, Iterator, List
+from .storage import StorageConflict, dumps_policy, receipt_from_row
 
 INIT_SQL = """
 -- Enable WAL mode equivalent (default in PostgreSQL)
@@ -137,7 +137,7 @@ class PostgreSQLStorage:
                         VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """, (
                         receipt["trace_id"], hop, receipt["ts"], receipt["cid"], receipt["canon"], 
-                        receipt["algo"], receipt.get("prev_receipt_hash"), json.dumps(receipt["policy"]), 
+                        receipt["algo"], receipt.get("prev_receipt_hash"), dumps_policy(receipt["policy"]), 
                         receipt["tenant"], receipt["receipt_hash"]
                     ))
                     
@@ -162,31 +162,24 @@ class PostgreSQLStorage:
                     raise StorageConflict("Receipt already exists")
                 raise
 
-    def get_chain(self, trace_id: str):
-        """Get the complete receipt chain for a trace"""
+    def iter_chain(self, trace_id: str, batch_size: int = 256) -> Iterator[Dict[str, Any]]:
+        """Yield a trace's receipts in hop order without materializing the whole chain"""
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT * FROM receipts WHERE trace_id = %s ORDER BY hop ASC",
                     (trace_id,)
                 )
-                rows = cur.fetchall()
-                
-                out = []
-                for r in rows:
-                    out.append({
-                        "trace_id": r["trace_id"],
-                        "hop": r["hop"],
-                        "ts": r["ts"],
-                        "cid": r["cid"],
-                        "canon": r["canon"],
-                        "algo": r["algo"],
-                        "prev_receipt_hash": r["prev_receipt_hash"],
-                        "policy": json.loads(r["policy_json"]),
-                        "tenant": r["tenant"],
-                        "receipt_hash": r["receipt_hash"]
-                    })
-                return out
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    for r in rows:
+                        yield receipt_from_row(r)
+
+    def get_chain(self, trace_id: str):
+        """Get the complete receipt chain for a trace"""
+        return list(self.iter_chain(trace_id))
 
     def cache_idempotent(self, api_key: str, idem_key: str, response_json: Dict[str, Any]):
         """Cache an idempotent response"""
@@ -223,6 +216,18 @@ class PostgreSQLStorage:
                 """, (api_key, tenant, trace_id, hop, 1 if verified else 0, vex_units, fu_tokens, ts))
             conn.commit()
 
+    def record_usage_many(self, rows):
+        """Record several usage rows in one transaction"""
+        if not rows:
+            return
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO usage_ledger(api_key, tenant, trace_id, hop, verified, vex_units, fu_tokens, ts)
+                    VALUES %s
+                """, rows)
+            conn.commit()
+
     def enqueue_billing(self, api_key: str, stripe_item: str, units: int, ts_unix: int):
         """Enqueue billing event"""
         with self._get_connection() as conn:
@@ -233,16 +238,27 @@ class PostgreSQLStorage:
                 """, (api_key, stripe_item, units, ts_unix))
             conn.commit()
 
-    def dequeue_billing_batch(self, limit: int = 100):
-        """Get a batch of billing events to process"""
+    def enqueue_billing_many(self, rows):
+        """Enqueue several billing events in one transaction"""
+        if not rows:
+            return
         with self._get_connection() as conn:
             with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO billing_queue(api_key, stripe_item, units, ts, retries)
+                    VALUES %s
+                """, rows, template="(%s, %s, %s, %s, 0)")
+            conn.commit()
+
+    def dequeue_billing_batch(self, limit: int = 100):
+        """Get a batch of billing events as (id, stripe_item, units, ts, retries) tuples"""
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
                 cur.execute(
-                    "SELECT * FROM billing_queue ORDER BY id ASC LIMIT %s",
+                    "SELECT id, stripe_item, units, ts, retries FROM billing_queue ORDER BY id ASC LIMIT %s",
                     (limit,)
                 )
-                rows = cur.fetchall()
-                return [dict(r) for r in rows]
+                return cur.fetchall()
 
     def delete_billing_items(self, ids):
         """Delete processed billing items"""
@@ -1,5 +1,6 @@
-import json, jmespath
-from typing import Dict, Any, Any as AnyType
+import json, re, jmespath
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, Any, Any as AnyType
 from .functions.currency import to_minor
 
 FUNCTIONS = { "to_minor": to_minor }
@@ -9,18 +10,17 @@ def apply_function(func_name: str, args: list):
         raise ValueError(f"Unknown function: {func_name}")
     return FUNCTIONS[func_name](*args)
 
+# One argument (quoted spans may contain commas) followed by its separator
+_ARG_RE = re.compile(r"((?:'[^']*(?:'|$)|[^,'])*)(,|$)")
+
 def split_args(s: str):
-    buf, out, in_str = "", [], False
-    for ch in s:
-        if ch == "'" and not in_str:
-            in_str = True; buf += ch; continue
-        if ch == "'" and in_str:
-            in_str = False; buf += ch; continue
-        if ch == "," and not in_str:
-            out.append(buf.strip()); buf=""; continue
-        buf += ch
-    if buf.strip():
-        out.append(buf.strip())
+    out = []
+    for m in _ARG_RE.finditer(s):
+        arg, sep = m.groups()
+        if sep or arg.strip():
+            out.append(arg.strip())
+        if not sep:
+            break
     return out
 
 def set_deep(obj: Dict[str, Any], dotted: str, value: AnyType):
@@ -32,27 +32,67 @@ def set_deep(obj: Dict[str, Any], dotted: str, value: AnyType):
         cur = cur[p]
     cur[parts[-1]] = value
 
+@lru_cache(maxsize=1024)
+def _jc(expr: str):
+    """Parsed jmespath expression, shared by every mapping that uses it."""
+    return jmespath.compile(expr)
+
+@lru_cache(maxsize=1024)
+def _setter(dotted: str):
+    """Generate a setter with the path walk unrolled, same semantics as set_deep."""
+    *parents, leaf = dotted.split(".")
+    lines = ["def set_value(obj, value):", "    cur = obj"]
+    for p in parents:
+        lines += [f"    nxt = cur.get({p!r})",
+                  "    if not isinstance(nxt, dict):",
+                  f"        nxt = cur[{p!r}] = {{}}",
+                  "    cur = nxt"]
+    lines.append(f"    cur[{leaf!r}] = value")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["set_value"]
+
+def _evaluator(expr: AnyType):
+    if not isinstance(expr, str):
+        return lambda payload: expr
+    if "(" in expr and expr.endswith(")") and expr.split("(")[0] in FUNCTIONS:
+        name = expr.split("(")[0]
+        func = FUNCTIONS[name]
+        args_str = expr[len(name)+1:-1]
+        arg_fns = []
+        if args_str.strip():
+            for part in split_args(args_str):
+                part = part.strip()
+                if part.startswith("'") and part.endswith("'"):
+                    literal = part[1:-1]
+                    arg_fns.append(lambda payload, literal=literal: literal)
+                else:
+                    arg_fns.append(_jc(part).search)
+        return lambda payload: func(*[fn(payload) for fn in arg_fns])
+    return _jc(expr).search
+
+def compile_mapping(mapping: Dict[str, Any]) -> List[Tuple[Callable, Callable]]:
+    """Parse a mapping's assignments once into (setter, evaluator) pairs."""
+    return [(_setter(target_path), _evaluator(expr))
+            for target_path, expr in mapping.get("assign", {}).items()]
+
+# Keyed by id(); the entry holds the mapping itself so the id cannot be reused.
+# Mappings are treated as immutable once they have been used for a transform.
+_COMPILED: Dict[int, Tuple[Dict[str, Any], List[Tuple[Callable, Callable]]]] = {}
+_COMPILED_MAX = 128
+
+def _compiled(mapping: Dict[str, Any]) -> List[Tuple[Callable, Callable]]:
+    entry = _COMPILED.get(id(mapping))
+    if entry is not None and entry[0] is mapping:
+        return entry[1]
+    program = compile_mapping(mapping)
+    if len(_COMPILED) >= _COMPILED_MAX:
+        _COMPILED.clear()
+    _COMPILED[id(mapping)] = (mapping, program)
+    return program
+
 def transform(payload: Dict[str, Any], mapping: Dict[str, Any]) -> Dict[str, Any]:
     out = {}
-    for target_path, expr in mapping.get("assign", {}).items():
-        value = None
-        if isinstance(expr, str):
-            if "(" in expr and expr.endswith(")") and expr.split("(")[0] in FUNCTIONS:
-                name = expr.split("(")[0]
-                args_str = expr[len(name)+1:-1]
-                args = []
-                if args_str.strip():
-                    parts = split_args(args_str)
-                    for part in parts:
-                        part = part.strip()
-                        if part.startswith("'") and part.endswith("'"):
-                            args.append(part[1:-1])
-                        else:
-                            args.append(jmespath.search(part, payload))
-                value = apply_function(name, args)
-            else:
-                value = jmespath.search(expr, payload)
-        else:
-            value = expr
-        set_deep(out, target_path, value)
+    for set_value, evaluate in _compiled(mapping):
+        set_value(out, evaluate(payload))
     return out
@@ -1,5 +1,6 @@
-import os, json
-from pydantic import BaseModel
+import os
+from functools import lru_cache
+from pydantic import BaseModel, Field, RootModel, ValidationError
 from typing import Dict, List, Optional
 
 def _getenv(*names, default=None):
@@ -18,6 +19,9 @@ class TenantConfig(BaseModel):
     fallback_enabled: bool = False
     fu_monthly_limit: Optional[int] = None  # FU quota limit per month
 
+class ApiKeys(RootModel[Dict[str, TenantConfig]]):
+    """SP_API_KEYS: API key -> tenant config, parsed straight from the JSON string"""
+
 class Settings(BaseModel):
     api_keys: Dict[str, TenantConfig]
     hel_allowlist: List[str]
@@ -27,7 +31,7 @@ class Settings(BaseModel):
     kid: Optional[str] = None
     stripe_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
-    port: int = int(_getenv("PORT", default="8088"))
+    port: int = Field(default_factory=lambda: int(_getenv("PORT", default="8088")))
     
     # Storage configuration
     storage_type: str = "sqlite"  # "sqlite" or "postgres"
@@ -39,12 +43,12 @@ class Settings(BaseModel):
 def load_settings() -> Settings:
     raw = _getenv("SP_API_KEYS", "AB_API_KEYS", default="{}")
     try:
-        mapping = json.loads(raw)
-    except Exception:
-        mapping = {}
-    api_keys = {}
-    for k, v in mapping.items():
-        api_keys[k] = TenantConfig(**v)
+        api_keys = ApiKeys.model_validate_json(raw).root
+    except ValidationError as e:
+        # Unparseable JSON means "no keys"; invalid tenant entries still fail loudly
+        if not any(err["type"] == "json_invalid" for err in e.errors()):
+            raise
+        api_keys = {}
 
     hel = _getenv("SP_HEL_ALLOWLIST", "AB_HEL_ALLOWLIST", default="")
     hel_allowlist = [h.strip() for h in hel.split(",") if h.strip()]
@@ -77,6 +81,15 @@ def load_settings() -> Settings:
     )
     return settings
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide settings, parsed from the environment once"""
+    return load_settings()
+
+def settings_cache_clear():
+    """Drop cached settings so the next get_settings() re-reads the environment"""
+    get_settings.cache_clear()
+
 def create_storage_from_settings(settings: Settings):
     """Factory function to create appropriate storage backend"""
     if settings.storage_type == "postgres":
@@ -0,0 +1,16 @@
+import time
+
+# (unix second, formatted timestamp); swapped as one tuple so readers never see a torn pair
+_last = (-1, "")
+
+def utcnow_iso() -> str:
+    """Current UTC time as "YYYY-MM-DDTHH:MM:SSZ", formatted at most once per second."""
+    global _last
+    sec = int(time.time())
+    cached = _last
+    if cached[0] == sec:
+        return cached[1]
+    t = time.gmtime(sec)
+    stamp = f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    _last = (sec, stamp)
+    return stamp
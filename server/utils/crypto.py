@@ -1,16 +1,22 @@
-import base64, json, time
+import base64, json
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from nacl.signing import SigningKey
 from nacl.encoding import RawEncoder
-from .jcs import canonicalize, sha256_hexdigest
+from .clock import utcnow_iso
+from .jcs import canonicalize_bytes, sha256_cid
+
+# Padding needed to restore a base64 string, indexed by its length mod 4
+_PAD = ("", "===", "==", "=")
 
 def b64url_decode_nopad(s: str) -> bytes:
-    pad = '=' * ((4 - len(s) % 4) % 4)
-    return base64.urlsafe_b64decode(s + pad)
+    return base64.urlsafe_b64decode(s + _PAD[len(s) & 3])
 
 def b64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode().rstrip('=')
 
+# SigningKey is immutable, so one instance per seed can be shared across callers
+@lru_cache(maxsize=8)
 def load_signing_key(seed_b64url: Optional[str]) -> Optional[SigningKey]:
     if not seed_b64url:
         return None
@@ -32,10 +38,10 @@ def make_jwk_from_signing_key(kid: str, sk: SigningKey) -> Dict[str, Any]:
     }
 
 def sign_export_bundle(sk: SigningKey, kid: str, bundle: Dict[str, Any]) -> Dict[str, str]:
-    canon = canonicalize(bundle).encode("utf-8")
-    bundle_cid = "sha256:" + sha256_hexdigest(canon)
-    exported_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    payload = f"{bundle_cid}|{bundle.get('trace_id')}|{exported_at}".encode("utf-8")
+    bundle_cid = sha256_cid(canonicalize_bytes(bundle))
+    # Sign the timestamp the bundle carries, so verifiers see the same value
+    exported_at = bundle.get("exported_at") or utcnow_iso()
+    payload = b"|".join((bundle_cid.encode("ascii"), str(bundle.get("trace_id")).encode("utf-8"), exported_at.encode("ascii")))
     sig = sk.sign(payload).signature
     return {
         "bundle_cid": bundle_cid,
@@ -7,12 +7,18 @@ This implementation ensures:
 - Correct escape sequences
 - Stable canonicalization for receipt hashes
 """
+import hashlib
 import json
 import unicodedata
 import re
-from typing import Any
+from typing import Any, FrozenSet
 from decimal import Decimal
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def normalize_unicode(text: str) -> str:
     """Normalize Unicode text to NFC form as per RFC 8785"""
     return unicodedata.normalize('NFC', text)
@@ -54,8 +60,14 @@ def escape_string(s: str) -> str:
     escaped = json.dumps(s, ensure_ascii=False, separators=(',', ':'))
     return escaped
 
-def canonicalize_value(obj: Any) -> str:
-    """Recursively canonicalize a JSON value according to RFC 8785"""
+_NO_KEYS: FrozenSet[str] = frozenset()
+
+def canonicalize_value(obj: Any, exclude: FrozenSet[str] = _NO_KEYS) -> str:
+    """Recursively canonicalize a JSON value according to RFC 8785
+
+    Top-level dict keys in ``exclude`` are skipped, so callers hashing a
+    document without one of its fields don't need to copy it first.
+    """
     if obj is None:
         return "null"
     elif isinstance(obj, bool):
@@ -71,6 +83,8 @@ def canonicalize_value(obj: Any) -> str:
         # Sort keys and canonicalize recursively
         sorted_items = []
         for key in sorted(obj.keys()):
+            if key in exclude:
+                continue
             if not isinstance(key, str):
                 raise ValueError(f"Dictionary keys must be strings, got {type(key)}")
             canonical_key = escape_string(key)
@@ -80,7 +94,41 @@ def canonicalize_value(obj: Any) -> str:
     else:
         raise ValueError(f"Unsupported type for JCS canonicalization: {type(obj)}")
 
-def canonicalize(obj: Any) -> str:
+_is_nfc = unicodedata.is_normalized
+
+def _orjson_equivalent(obj: Any) -> bool:
+    """True if orjson's sorted-key output is byte-identical to canonicalize_value.
+
+    That holds for NFC strings, 64-bit ints, bools, None and containers of them;
+    floats (number formatting) and non-NFC text (normalization) take the slow path.
+    """
+    t = type(obj)
+    if t is str:
+        return _is_nfc("NFC", obj)
+    if t is dict:
+        return all(
+            type(k) is str and _is_nfc("NFC", k) and _orjson_equivalent(v)
+            for k, v in obj.items()
+        )
+    if t is list:
+        return all(_orjson_equivalent(v) for v in obj)
+    if t is int:
+        return -(1 << 63) <= obj < (1 << 64)
+    return obj is None or t is bool
+
+def canonicalize_bytes(obj: Any, exclude: FrozenSet[str] = _NO_KEYS) -> bytes:
+    """UTF-8 encoded canonicalize(obj, exclude), produced by orjson when that is exact."""
+    if orjson is not None and _orjson_equivalent(obj):
+        if exclude and type(obj) is dict:
+            # orjson cannot skip keys; a shallow filtered view is still far cheaper than the slow path
+            obj = {k: v for k, v in obj.items() if k not in exclude}
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return canonicalize(obj, exclude).encode("utf-8")
+
+def canonicalize(obj: Any, exclude: FrozenSet[str] = _NO_KEYS) -> str:
     """
     Canonicalize a JSON object according to RFC 8785.
     
@@ -90,24 +138,32 @@ def canonicalize(obj: Any) -> str:
     - Sorted object keys
     - Minimal whitespace
     - Consistent escape sequences
+
+    Top-level keys listed in ``exclude`` are left out of the output.
     """
     try:
-        return canonicalize_value(obj)
+        return canonicalize_value(obj, exclude)
     except Exception as e:
         # Fallback to basic JSON serialization if strict canonicalization fails
         # This maintains backward compatibility while logging the issue
         import logging
         logging.warning(f"JCS canonicalization failed, falling back to basic JSON: {e}")
+        if exclude and isinstance(obj, dict):
+            obj = {k: v for k, v in obj.items() if k not in exclude}
         return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
 
+_sha256 = hashlib.sha256
+
 def sha256_hexdigest(data: bytes) -> str:
-    import hashlib
-    return hashlib.sha256(data).hexdigest()
+    return _sha256(data).hexdigest()
+
+def sha256_cid(data: bytes) -> str:
+    """Content identifier ("sha256:<hex>") for already-canonical bytes."""
+    return "sha256:" + _sha256(data).hexdigest()
 
 def cid_for_json(obj: Any) -> str:
     """Generate a content identifier for a JSON object using RFC 8785 JCS"""
-    canon = canonicalize(obj).encode("utf-8")
-    return "sha256:" + sha256_hexdigest(canon)
+    return sha256_cid(canonicalize_bytes(obj))
 
 # Legacy function for backward compatibility
 def canonicalize_legacy(obj: Any) -> str:
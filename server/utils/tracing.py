@@ -1,49 +1,71 @@
 import os
 from contextlib import contextmanager
-from time import time
 from typing import Iterator, Optional
 
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 
 _tracer_initialized = False
+# Until init_tracer installs a provider this is a proxy that switches over to it
+_tracer = trace.get_tracer("signet.protocol")
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
 
 def init_tracer(service_name: str = "signet-protocol"):
     global _tracer_initialized
     if _tracer_initialized:
         return
+    _tracer_initialized = True
     endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")  # optional
+    if not endpoint:
+        # No endpoint configured: keep the default no-op provider so spans cost nothing
+        return
+    try:
+        exporter = OTLPSpanExporter(endpoint=endpoint)
+    except Exception as e:
+        print(f"Warning: OTLP exporter unavailable, tracing disabled: {e}")
+        return
     resource = Resource.create({"service.name": service_name})
-    provider = TracerProvider(resource=resource)
-    if endpoint:
-        try:
-            exporter = OTLPSpanExporter(endpoint=endpoint)
-            provider.add_span_processor(BatchSpanProcessor(exporter))
-        except Exception:
-            provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
-    else:
-        # No endpoint configured; default to console exporter (no network IO)
-        provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    # Head-based sampling; child spans follow the root's decision so traces stay whole
+    sampler = ParentBased(TraceIdRatioBased(_env_float("SP_OTEL_SAMPLE_RATIO", 0.05)))
+    provider = TracerProvider(resource=resource, sampler=sampler)
+    provider.add_span_processor(BatchSpanProcessor(
+        exporter,
+        max_queue_size=_env_int("SP_OTEL_MAX_QUEUE_SIZE", 4096),
+        schedule_delay_millis=_env_int("SP_OTEL_SCHEDULE_DELAY_MS", 1000),
+        max_export_batch_size=_env_int("SP_OTEL_MAX_EXPORT_BATCH_SIZE", 256),
+        export_timeout_millis=_env_int("SP_OTEL_EXPORT_TIMEOUT_MS", 10000),
+    ))
     trace.set_tracer_provider(provider)
-    _tracer_initialized = True
 
 @contextmanager
 def start_span(name: str):
-    tracer = trace.get_tracer("signet.protocol")
-    with tracer.start_as_current_span(name) as span:
-        t0 = time()
+    with _tracer.start_as_current_span(name) as span:
+        if not span.is_recording():
+            # Unsampled or tracing disabled: skip attribute work
+            yield span
+            return
+        # Latency comes from the span's own start/end timestamps
         try:
             yield span
         except Exception as e:
             span.record_exception(e)
             span.set_attribute("error", True)
             raise
-        finally:
-            span.set_attribute("duration_ms", (time() - t0) * 1000.0)
 
 # Convenience wrapper to annotate phase latency
 @contextmanager
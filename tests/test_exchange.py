@@ -1,7 +1,7 @@
 import os, json
 from fastapi.testclient import TestClient
 from unittest.mock import patch
-from server.settings import Settings, TenantConfig
+from server.settings import Settings, TenantConfig, settings_cache_clear
 import sys, importlib
 
 def test_happy_path():
@@ -27,6 +27,7 @@ def test_happy_path():
     )
 
     # Fresh import of server.main under patched settings
+    settings_cache_clear()
     if 'server.main' in sys.modules:
       del sys.modules['server.main']
     from server import main as server_main
@@ -58,3 +59,84 @@ def test_happy_path():
       assert "trace_id" in response_data
       assert "normalized" in response_data
       assert "receipt" in response_data
+
+def test_batch_reports_per_item_results(tmp_path):
+  """Batch endpoint runs each exchange independently and keys results by idempotency key"""
+  with patch('server.settings.load_settings') as mock_settings:
+    mock_settings.return_value = Settings(
+      api_keys={"test": TenantConfig(tenant="acme", allowlist=[], fallback_enabled=False)},
+      hel_allowlist=[],
+      db_path=str(tmp_path / "batch.db"),
+      storage_type="sqlite",
+      reserved_config_path=None
+    )
+    settings_cache_clear()
+    if 'server.main' in sys.modules:
+      del sys.modules['server.main']
+    server_main = importlib.import_module("server.main")
+  settings_cache_clear()
+  client = TestClient(server_main.app)
+
+  good = {
+    "payload_type": "openai.tooluse.invoice.v1",
+    "target_type": "invoice.iso20022.v1",
+    "payload": {
+      "tool_calls": [{
+        "type": "function",
+        "function": {
+          "name": "create_invoice",
+          "arguments": "{\"invoice_id\":\"INV-2\",\"amount\":10,\"currency\":\"USD\",\"customer_name\":\"Acme\",\"description\":\"Services\"}"
+        }
+      }]
+    }
+  }
+  bad = {"payload_type": "openai.tooluse.invoice.v1"}
+  headers = {"X-SIGNET-API-Key": "test", "X-SIGNET-Idempotency-Key": "batch-1"}
+  r = client.post("/v1/exchange:batch", json={"exchanges": [good, bad]}, headers=headers)
+
+  assert r.status_code == 200
+  results = r.json()["results"]
+  assert [res["idempotency_key"] for res in results] == ["batch-1:0", "batch-1:1"]
+  assert results[0]["status_code"] == 200
+  assert "receipt" in results[0]["response"]
+  assert results[1]["status_code"] == 422
+
+def test_export_rejects_tampered_chain(tmp_path):
+  """Export verifies the stored receipt hashes before returning (and signing) the bundle"""
+  with patch('server.settings.load_settings') as mock_settings:
+    mock_settings.return_value = Settings(
+      api_keys={"test": TenantConfig(tenant="acme", allowlist=[], fallback_enabled=False)},
+      hel_allowlist=[],
+      db_path=str(tmp_path / "export.db"),
+      storage_type="sqlite",
+      reserved_config_path=None
+    )
+    settings_cache_clear()
+    if 'server.main' in sys.modules:
+      del sys.modules['server.main']
+    server_main = importlib.import_module("server.main")
+  settings_cache_clear()
+  client = TestClient(server_main.app)
+
+  body = {
+    "payload_type": "openai.tooluse.invoice.v1",
+    "target_type": "invoice.iso20022.v1",
+    "payload": {
+      "tool_calls": [{
+        "type": "function",
+        "function": {
+          "name": "create_invoice",
+          "arguments": "{\"invoice_id\":\"INV-3\",\"amount\":10,\"currency\":\"USD\",\"customer_name\":\"Acme\",\"description\":\"Services\"}"
+        }
+      }]
+    },
+    "trace_id": "export-1"
+  }
+  headers = {"X-SIGNET-API-Key": "test", "X-SIGNET-Idempotency-Key": "export-1"}
+  assert client.post("/v1/exchange", json=body, headers=headers).status_code == 200
+  assert client.get("/v1/receipts/export/export-1").status_code == 200
+
+  with server_main.STORE._conn() as c:
+    c.execute("UPDATE receipts SET cid=? WHERE trace_id=?", ("sha256:tampered", "export-1"))
+  r = client.get("/v1/receipts/export/export-1")
+  assert r.status_code == 500
@@ -1,2 +1,17 @@
+from nacl.signing import SigningKey
+from server.utils.crypto import b64url_decode_nopad, b64url_encode, load_signing_key, sign_export_bundle
+
 def test_placeholder():
     assert True
+
+def test_sign_export_bundle_uses_bundle_timestamp():
+    sk = SigningKey.generate()
+    bundle = {"trace_id": "t-1", "chain": [], "exported_at": "2025-01-27T12:00:00Z"}
+    signed = sign_export_bundle(sk, "kid-1", bundle)
+    assert signed["exported_at"] == bundle["exported_at"]
+    payload = f"{signed['bundle_cid']}|t-1|2025-01-27T12:00:00Z".encode("utf-8")
+    sk.verify_key.verify(payload, b64url_decode_nopad(signed["signature"]))
+
+def test_load_signing_key_reuses_instance():
+    seed = b64url_encode(bytes(range(32)))
+    assert load_signing_key(seed) is load_signing_key(seed)
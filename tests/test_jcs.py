@@ -6,7 +6,8 @@ from server.utils.jcs import (
     normalize_unicode, 
     format_number, 
     escape_string,
-    canonicalize_legacy
+    canonicalize_legacy,
+    canonicalize_bytes
 )
 
 class TestRFC8785Compliance:
@@ -264,5 +265,26 @@ class TestEdgeCases:
         # Note: Small floats may be represented in scientific notation
         assert ("0.000001" in canonical) or ("1e-06" in canonical)
 
+class TestCanonicalBytes:
+    """canonicalize_bytes must always match canonicalize"""
+
+    def test_matches_canonicalize(self):
+        samples = [
+            {"b": [1, True, None], "a": "café", "c": {"z": "\n\t\"", "y": -(2**63)}},
+            {"amount": 19.99, "n": 1.0},
+            {"name": "café"},
+            {"big": 2**70},
+            [],
+        ]
+        for obj in samples:
+            assert canonicalize_bytes(obj) == canonicalize(obj).encode("utf-8")
+
+    def test_exclude_matches_copy_without_key(self):
+        for obj in ({"a": 1, "receipt_hash": "x", "b": "café"}, {"f": 1.5, "receipt_hash": "x"}):
+            expected = canonicalize({k: v for k, v in obj.items() if k != "receipt_hash"})
+            assert canonicalize(obj, frozenset(("receipt_hash",))) == expected
+            assert canonicalize_bytes(obj, frozenset(("receipt_hash",))) == expected.encode("utf-8")
+            assert "receipt_hash" in obj
+
 if __name__ == "__main__":
     pytest.main([__file__])
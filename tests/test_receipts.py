@@ -0,0 +1,20 @@
+from server.pipeline.receipts import make_receipt, verify_chain_hashes
+
+def _chain(n):
+    chain, prev = [], None
+    for hop in range(1, n + 1):
+        r = make_receipt("trace-1", hop, "acme", f"sha256:{hop:04d}", {"engine": "HEL", "allowed": True}, prev)
+        chain.append(r)
+        prev = r["receipt_hash"]
+    return chain
+
+def test_verify_chain_hashes():
+    chain = _chain(3)
+    assert verify_chain_hashes(chain)
+    chain[1]["policy"] = {"engine": "HEL", "allowed": False}
+    assert not verify_chain_hashes(chain)
+
+def test_verify_chain_hashes_detects_broken_link():
+    chain = _chain(3)
+    del chain[1]
+    assert not verify_chain_hashes(chain)
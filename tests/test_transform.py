@@ -0,0 +1,26 @@
+from server.pipeline.transform import transform, compile_mapping
+
+MAPPING = {
+    "assign": {
+        "Document.Invoice.Id": "args.invoice_id",
+        "Document.Invoice.TotalMinor": "to_minor(args.amount, 'USD')",
+        "Document.Invoice.Party.Name": "args.customer_name",
+        "Document.Version": 1,
+    }
+}
+
+def test_transform_applies_assignments():
+    payload = {"args": {"invoice_id": "INV-1", "amount": 19.99, "customer_name": "Acme"}}
+    assert transform(payload, MAPPING) == {
+        "Document": {
+            "Invoice": {"Id": "INV-1", "TotalMinor": 1999, "Party": {"Name": "Acme"}},
+            "Version": 1,
+        }
+    }
+
+def test_compiled_mapping_is_reused_across_payloads():
+    assert len(compile_mapping(MAPPING)) == 4
+    first = transform({"args": {"invoice_id": "A", "amount": 1}}, MAPPING)
+    second = transform({"args": {"invoice_id": "B", "amount": 2}}, MAPPING)
+    assert first["Document"]["Invoice"]["Id"] == "A"
+    assert second["Document"]["Invoice"]["TotalMinor"] == 200